@@ -0,0 +1,39 @@
+"""
+BaseConfig construction and to_dict on a depth-1000 and a width-100k
+configuration.
+
+    python benchmarks/bench_base_config.py
+"""
+import timeit
+
+from pyaml_env import BaseConfig
+
+
+def deep(depth=1000):
+    data = {}
+    inner = data
+    for i in range(depth):
+        inner['a'] = {'value': i, 'items': [{'b': i}]}
+        inner = inner['a']
+    return data
+
+
+def wide(width=100000):
+    return {f'key{i}': {'value': i, 'items': [i]} for i in range(width)}
+
+
+def main(number=5):
+    for name, data in (('depth-1000', deep()), ('width-100k', wide())):
+        config = BaseConfig(data)
+        construct = min(timeit.repeat(
+            lambda: BaseConfig(data), number=number, repeat=3
+        ))
+        to_dict = min(timeit.repeat(
+            config.to_dict, number=number, repeat=3
+        ))
+        print(f'{name:<11} BaseConfig(): {construct / number * 1000:8.2f} ms  '
+              f'to_dict(): {to_dict / number * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
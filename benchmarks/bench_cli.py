@@ -0,0 +1,52 @@
+"""
+Rendering 200 small configuration files to json: one pyaml-env process per
+file against a single `pyaml-env --batch` process.
+
+    python benchmarks/bench_cli.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+CONFIG = '''
+database:
+  url: !ENV http://${DB_HOST:localhost}:${DB_PORT:5432}
+  pool: 5
+tenants:
+  - acme
+  - globex
+'''
+
+COMMAND = [sys.executable, '-m', 'pyaml_env.cli']
+
+
+def main(files=200):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i in range(files):
+            paths.append(os.path.join(tmp_dir, f'config{i}.yaml'))
+            with open(paths[-1], 'w') as conf_file:
+                conf_file.write(CONFIG)
+
+        start = time.perf_counter()
+        for path in paths:
+            subprocess.run(COMMAND + [path], check=True, stdout=subprocess.PIPE)
+        per_file = time.perf_counter() - start
+
+        start = time.perf_counter()
+        output = subprocess.run(
+            COMMAND + ['--batch'], check=True, stdout=subprocess.PIPE,
+            input='\n'.join(paths * 5), universal_newlines=True
+        ).stdout
+        batch = time.perf_counter() - start
+        assert len(output.splitlines()) == files * 5
+
+    print(f'one process per file: {per_file / files * 1000:8.2f} ms per file')
+    print(f'--batch:              {batch / (files * 5) * 1000:8.2f} ms per file'
+          f' ({files * 5} requests, each file 5 times)')
+
+
+if __name__ == '__main__':
+    main()
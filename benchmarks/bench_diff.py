@@ -0,0 +1,53 @@
+"""
+Comparing two parses of a configuration with 1k sections of 50 keys each,
+where one value changed: == over the whole tree against diff_config over
+content hashes, and the cost of content_hashes=True on the parse itself.
+
+    python benchmarks/bench_diff.py
+"""
+import timeit
+
+from pyaml_env import parse_config, diff_config
+
+
+def document(sections=1000, keys=50, changed=None):
+    lines = []
+    for i in range(sections):
+        lines.append(f'section{i}:')
+        for j in range(keys):
+            value = 'changed' if (i, j) == changed else f'value{j}'
+            lines.append(f'  key{j}: !ENV ${{BENCH_UNSET:{value}}}')
+    return '\n'.join(lines) + '\n'
+
+
+def main(number=5):
+    old_data = document()
+    new_data = document(changed=(750, 10))
+
+    parse = min(timeit.repeat(
+        lambda: parse_config(data=old_data), number=1, repeat=3
+    ))
+    parse_hashed = min(timeit.repeat(
+        lambda: parse_config(data=old_data, content_hashes=True),
+        number=1, repeat=3
+    ))
+    print(f'parse_config():                     {parse * 1000:8.1f} ms')
+    print(f'parse_config(content_hashes=True):  {parse_hashed * 1000:8.1f} ms')
+
+    old, new = parse_config(data=old_data), parse_config(data=new_data)
+    old_hashed = parse_config(data=old_data, content_hashes=True)
+    new_hashed = parse_config(data=new_data, content_hashes=True)
+    print(f'changed: {diff_config(old_hashed, new_hashed)}')
+
+    for name, func in (
+            ('== over the tree', lambda: old == new),
+            ('diff_config() without hashes', lambda: diff_config(old, new)),
+            ('diff_config() with hashes',
+             lambda: diff_config(old_hashed, new_hashed)),
+    ):
+        elapsed = min(timeit.repeat(func, number=number, repeat=3))
+        print(f'{name:<30} {elapsed / number * 1000:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+The import time of `import pyaml_env` as reported by `python -X importtime`,
+i.e. the package and everything it imports that was not imported at
+startup already. Fails if the median over the runs is over the budget, or
+if yaml is imported.
+
+    python benchmarks/bench_import_time.py [budget in ms]
+"""
+import statistics
+import subprocess
+import sys
+
+
+def import_time(statement='import pyaml_env'):
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        check=True, stderr=subprocess.PIPE, universal_newlines=True
+    ).stderr
+    imported = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            imported[name.strip()] = int(cumulative) / 1000
+    return imported
+
+
+def first_use_time(name='parse_config'):
+    # the lazy imports go through importlib, that -X importtime does not see
+    return float(subprocess.run(
+        [sys.executable, '-c',
+         'import time, pyaml_env; start = time.perf_counter(); '
+         f'pyaml_env.{name}; print((time.perf_counter() - start) * 1000)'],
+        check=True, stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout)
+
+
+def main(budget=10.0, runs=15):
+    times = []
+    for _ in range(runs):
+        imported = import_time()
+        if 'yaml' in imported:
+            print('FAIL: import pyaml_env imports yaml')
+            return 1
+        times.append(imported['pyaml_env'])
+    median = statistics.median(times)
+    first_use = statistics.median(first_use_time() for _ in range(5))
+    print(f'import pyaml_env:              {median:6.2f} ms '
+          f'(median of {runs}, budget {budget:.2f} ms)')
+    print(f'first use of parse_config:     {first_use:6.2f} ms')
+    if median > budget:
+        print('FAIL: over budget')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*map(float, sys.argv[1:2])))
@@ -0,0 +1,73 @@
+"""
+Memory held by 5k similar tenant configurations, parsed with and without a
+shared InternTable, as measured by tracemalloc.
+
+    python benchmarks/bench_intern.py
+"""
+import gc
+import time
+import tracemalloc
+
+from pyaml_env import parse_config, InternTable
+
+CONFIG = '''
+tenant:
+  name: tenant-{i}
+  region: !ENV ${{REGION:eu-west-{region}}}
+  tier: standard
+database:
+  host: !ENV ${{DB_HOST:db-{region}.internal}}
+  port: !ENV tag:yaml.org,2002:int ${{DB_PORT:5432}}
+  user: !ENV ${{DB_USER:app}}
+  pool_size: 10
+  options:
+    sslmode: require
+    connect_timeout: 10
+cache:
+  host: !ENV ${{CACHE_HOST:cache-{region}.internal}}
+  ttl: 300
+features:
+  - billing
+  - reports
+  - audit-log
+logging:
+  level: !ENV ${{LOG_LEVEL:info}}
+  format: json
+  handlers:
+    - console
+    - file
+'''
+
+
+def measure(documents, intern_table=None):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    configs = [
+        parse_config(data=data, intern_table=intern_table)
+        for data in documents
+    ]
+    elapsed = time.perf_counter() - start
+    if intern_table is not None:
+        # the table itself is kept alive by the caller, count it too
+        configs.append(intern_table)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, elapsed, configs
+
+
+def main(tenants=5000):
+    documents = [CONFIG.format(i=i, region=i % 3 + 1) for i in range(tenants)]
+    plain, plain_time, configs = measure(documents)
+    del configs
+    interned, interned_time, configs = measure(documents, InternTable())
+    print(f'{tenants} configurations')
+    print(f'without interning: {plain / 2 ** 20:7.2f} MiB  {plain_time:6.2f} s')
+    print(f'with InternTable:  {interned / 2 ** 20:7.2f} MiB  '
+          f'{interned_time:6.2f} s  ({len(configs[-1])} strings interned, '
+          f'{(1 - interned / plain) * 100:.1f}% less memory)')
+
+
+if __name__ == '__main__':
+    main()
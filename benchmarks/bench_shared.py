@@ -0,0 +1,68 @@
+"""
+Private memory of forked workers that each parse the configuration, compared
+to workers that map one file written by dump_shared in the master (Linux
+only, reads /proc/self/smaps_rollup).
+
+    python benchmarks/bench_shared.py
+"""
+import multiprocessing
+import os
+import tempfile
+
+from pyaml_env import parse_config, dump_shared, load_shared
+
+
+def generate(tenants=20000):
+    return '\n'.join(
+        f'tenant{i}:\n'
+        f'  host: !ENV ${{BENCH_HOST:localhost}}\n'
+        f'  region: eu-west-{i % 3}\n'
+        f'  limits: {{cpu: {i % 8}, memory: {i % 32}}}\n'
+        f'  tags: [a{i}, b{i}]'
+        for i in range(tenants)
+    )
+
+
+def private_kb():
+    with open('/proc/self/smaps_rollup') as smaps:
+        return sum(
+            int(line.split()[1]) for line in smaps
+            if line.startswith(('Private_Clean:', 'Private_Dirty:'))
+        )
+
+
+def parse_worker(path):
+    before = private_kb()
+    config = parse_config(path=path)
+    _ = config['tenant100']['region']
+    return private_kb() - before
+
+
+def shared_worker(path):
+    before = private_kb()
+    config = load_shared(path)
+    _ = config['tenant100']['region']
+    return private_kb() - before
+
+
+def main(workers=4):
+    with tempfile.TemporaryDirectory(dir='/dev/shm') as tmp:
+        yaml_path = os.path.join(tmp, 'config.yaml')
+        shared_path = os.path.join(tmp, 'config.bin')
+        with open(yaml_path, 'w') as yaml_file:
+            yaml_file.write(generate())
+        dump_shared(parse_config(path=yaml_path), shared_path)
+
+        context = multiprocessing.get_context('fork')
+        for name, worker, path in (
+                ('parse_config', parse_worker, yaml_path),
+                ('load_shared', shared_worker, shared_path),
+        ):
+            with context.Pool(workers) as pool:
+                sizes = pool.map(worker, [path] * workers, chunksize=1)
+            print(f'{name:<13} per worker: {max(sizes) / 1024:8.1f} MB private')
+        print(f'shared file:             {os.path.getsize(shared_path) / 2 ** 20:8.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
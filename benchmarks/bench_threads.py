@@ -0,0 +1,51 @@
+"""
+Throughput of parse_config called from 1 to 32 threads at once, each thread
+with its own tag, default_sep and default_value.
+
+    python benchmarks/bench_threads.py
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pyaml_env import parse_config
+
+OPTIONS = [
+    ('!ENV', ':', 'N/A'),
+    ('!TEST', ':', 'N/A'),
+    ('!ENV', '!', 'NONE'),
+    (None, ':', 'DEFAULT'),
+]
+
+
+def generate(tag, default_sep, keys=50):
+    return '\n'.join(
+        f'key{i}: {tag or ""} http://${{BENCH_HOST{default_sep}localhost}}:{i}'
+        if i % 5 == 0 else f'key{i}: value{i}'
+        for i in range(keys)
+    )
+
+
+def parse(i):
+    tag, default_sep, default_value = OPTIONS[i % len(OPTIONS)]
+    return parse_config(
+        data=generate(tag, default_sep),
+        tag=tag,
+        default_sep=default_sep,
+        default_value=default_value
+    )
+
+
+def main(parses=4000):
+    os.environ['BENCH_HOST'] = 'example.com'
+    for threads in (1, 2, 4, 8, 16, 32):
+        with ThreadPoolExecutor(threads) as executor:
+            start = time.perf_counter()
+            for _ in executor.map(parse, range(parses)):
+                pass
+            elapsed = time.perf_counter() - start
+        print(f'{threads:>2} threads: {parses / elapsed:8.0f} parses/s')
+
+
+if __name__ == '__main__':
+    main()
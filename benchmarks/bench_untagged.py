@@ -0,0 +1,43 @@
+"""
+Compare parse_config(tag=None), which resolves the environment variables in
+every plain scalar, with a plain yaml.safe_load of the same document.
+
+    python benchmarks/bench_untagged.py
+"""
+import os
+import timeit
+
+import yaml
+
+from pyaml_env import parse_config
+
+
+def generate(sections=200, keys=20, placeholder_every=20):
+    lines = []
+    for i in range(sections):
+        lines.append(f'section{i}:')
+        for j in range(keys):
+            if (i * keys + j) % placeholder_every == 0:
+                value = f'http://${{BENCH_HOST:localhost}}:{j}'
+            else:
+                value = ('value', '1024', '3.14', 'true', '2021-01-01')[j % 5]
+            lines.append(f'  key{j}: {value}')
+    return '\n'.join(lines)
+
+
+def main(number=20):
+    os.environ['BENCH_HOST'] = 'example.com'
+    data = generate()
+    safe_load = min(timeit.repeat(
+        lambda: yaml.safe_load(data), number=number, repeat=5
+    ))
+    untagged = min(timeit.repeat(
+        lambda: parse_config(data=data, tag=None), number=number, repeat=5
+    ))
+    print(f'yaml.safe_load:            {safe_load / number * 1000:.2f} ms')
+    print(f'parse_config(tag=None):    {untagged / number * 1000:.2f} ms '
+          f'({(untagged / safe_load - 1) * 100:+.1f}%)')
+
+
+if __name__ == '__main__':
+    main()
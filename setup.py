@@ -32,4 +32,9 @@ setup(name='pyaml_env',
       packages=[
           'pyaml_env',
       ],
+      entry_points={
+          'console_scripts': [
+              'pyaml-env=pyaml_env.cli:main',
+          ],
+      },
       )
@@ -1,4 +1,62 @@
-from .parse_config import parse_config
-from .base_config import BaseConfig
+import sys
 
-__all__ = ['parse_config', 'BaseConfig']
\ No newline at end of file
+# the public api and the module it is defined in. The modules, and yaml
+# with them, are only imported when one of their names is first used, so
+# that importing the package stays cheap.
+_exports = {
+    'parse_config': 'parse_config',
+    'BaseConfig': 'base_config',
+    'ConfigTemplate': 'config_template',
+    'diff_config': 'config_diff',
+    'hash_config': 'config_diff',
+    'HashedDict': 'config_diff',
+    'HashedList': 'config_diff',
+    'dump_config': 'dump_config',
+    'EnvTemplate': 'dump_config',
+    'FlatIndex': 'flat_index',
+    'InternTable': 'intern_table',
+    'ParseLimits': 'limits',
+    'ParseLimitExceeded': 'limits',
+    'Provider': 'providers',
+    'FileProvider': 'providers',
+    'scan_env_references': 'scan_env_references',
+    'find_missing_env_references': 'scan_env_references',
+    'EnvReference': 'scan_env_references',
+    'build_section_index': 'section_index',
+    'load_section': 'section_index',
+    'dump_shared': 'shared_config',
+    'load_shared': 'shared_config',
+    'SharedMapping': 'shared_config',
+    'SharedSequence': 'shared_config',
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    from importlib import import_module
+    value = getattr(import_module(f'.{_exports[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Package(type(sys)):
+    """
+    Importing a submodule binds it on the package, which would hide the
+    function of the same name, e.g. pyaml_env.parse_config, so bind the
+    function instead.
+    """
+
+    def __setattr__(self, name, value):
+        if isinstance(value, type(sys)) and _exports.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
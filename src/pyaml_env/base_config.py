@@ -1,35 +1,190 @@
 from typing import Any
 
+from .flat_index import FlatIndex
+
+# the attributes BaseConfig keeps for itself, they are not part of the config
+INTERNAL_FIELDS = frozenset(
+    ('_flat_index', '_indexed_root', '_is_validated', '_is_valid', '_errors')
+)
+
 
 class BaseConfig:
     """
     A base Config class to get
     """
 
-    def __init__(self, config_dict):
+    def __init__(self, config_dict, flat_index=False):
         if config_dict:
             self.__dict__.update(**{
                 k: v for k, v in self.__class__.__dict__.items()
                 if '__' not in k and not callable(v)
+                and not isinstance(v, (property, classmethod, staticmethod))
             })
             self.__dict__.update(**config_dict)
-        self._is_validated = False
-        self._is_valid = False
-        self._errors = []
-        self.__dict__ = self.__handle_inner_structures()
+        # every BaseConfig in an indexed tree points to the root, to drop
+        # the root's flat index when one of them is changed
+        self.__init_internal_fields(self if flat_index else None)
+        self.__handle_inner_structures(config_dict)
+        # indexed after wrapping, so that lookup returns the same objects
+        # with and without the index
+        self._flat_index = self.__build_flat_index() if flat_index else None
+
+    @classmethod
+    def from_dict(cls, config_dict, flat_index=False):
+        """
+        :param dict config_dict: the configuration, e.g. from parse_config
+        :param bool flat_index: build a FlatIndex for lookup
+        :return: the configuration with attribute access
+        :rtype: BaseConfig
+        """
+        return cls(config_dict, flat_index=flat_index)
+
+    def to_dict(self) -> dict:
+        """
+        Convert the configuration back to plain dicts and lists, without the
+        attributes BaseConfig keeps for itself.
+        :return: the configuration
+        :rtype: dict
+        """
+        result = {}
+        in_progress = set()
+        stack = [(self.__dict__, result)]
+        while stack:
+            source, target = stack.pop()
+            if target is None:
+                # every value below source has been converted
+                in_progress.discard(id(source))
+                continue
+            in_progress.add(id(source))
+            stack.append((source, None))
+            if isinstance(source, dict):
+                items = (
+                    (k, v) for k, v in source.items()
+                    if k not in INTERNAL_FIELDS
+                )
+            else:
+                items = enumerate(source)
+            for k, v in items:
+                if isinstance(v, BaseConfig):
+                    v = v.__dict__
+                if isinstance(v, (dict, list)):
+                    if id(v) in in_progress:
+                        raise ValueError(
+                            'Recursive structures can not be converted'
+                        )
+                    stack.append((v, {} if isinstance(v, dict) else []))
+                    v = stack[-1][1]
+                if isinstance(target, dict):
+                    target[k] = v
+                else:
+                    target.append(v)
+        return result
+
+    def __init_internal_fields(self, indexed_root=None):
+        # set on __dict__, past __setattr__, they are set for every
+        # BaseConfig in the tree
+        self.__dict__.update(
+            _flat_index=self.__dict__.get('_flat_index'),
+            _indexed_root=indexed_root,
+            _is_validated=False,
+            _is_valid=False,
+            _errors=[],
+        )
+
+    def __handle_inner_structures(self, config_dict):
+        """
+        Wrap every nested dict, also the ones in lists, in a BaseConfig. An
+        explicit stack is used instead of recursion, so that deeply nested
+        configurations do not hit the recursion limit. Lists are copied, the
+        given configuration is not modified. Recursive structures, e.g. from
+        `a: &a {b: *a}`, raise a ValueError.
+        """
+        in_progress = set()
+        stack = [(self.__dict__, id(config_dict))]
+        while stack:
+            container, source_id = stack.pop()
+            if container is None:
+                # every value below the source has been wrapped
+                in_progress.discard(source_id)
+                continue
+            in_progress.add(source_id)
+            stack.append((None, source_id))
+            if isinstance(container, dict):
+                items = [
+                    (k, v) for k, v in container.items()
+                    if k not in INTERNAL_FIELDS
+                ]
+            else:
+                items = enumerate(container)
+            for k, v in items:
+                if isinstance(v, (dict, list)) and id(v) in in_progress:
+                    raise ValueError(
+                        'Recursive structures can not be wrapped in a '
+                        'BaseConfig'
+                    )
+                if isinstance(v, dict):
+                    inner = BaseConfig.__new__(BaseConfig)
+                    inner.__dict__.update(v)
+                    inner.__init_internal_fields(self._indexed_root)
+                    container[k] = inner
+                    stack.append((inner.__dict__, id(v)))
+                elif isinstance(v, list):
+                    container[k] = list(v)
+                    stack.append((container[k], id(v)))
 
-    def __handle_inner_structures(self):
-        for k, v in self.__dict__.items():
-            if isinstance(v, dict):
-                self.__dict__[k] = BaseConfig(v)
-        return self.__dict__
+    def __build_flat_index(self):
+        return FlatIndex(self, items=_config_items)
 
     def __getattr__(self, field_name: str) -> Any:
         return self.__dict__[field_name]
 
+    def __setattr__(self, field_name: str, value: Any):
+        super().__setattr__(field_name, value)
+        if field_name not in INTERNAL_FIELDS:
+            self.__invalidate_flat_index()
+
+    def __delattr__(self, field_name: str):
+        super().__delattr__(field_name)
+        if field_name not in INTERNAL_FIELDS:
+            self.__invalidate_flat_index()
+
+    def __invalidate_flat_index(self):
+        root = self.__dict__.get('_indexed_root')
+        if root is not None:
+            # rebuilt by the next lookup
+            root.__dict__['_flat_index'] = None
+
     @property
     def errors(self):
         return self._errors
 
+    def lookup(self, path: str) -> Any:
+        """
+        Get a value by its dotted path, e.g. config.lookup('a.b.c') instead of
+        config.a.b.c. With flat_index=True this is a single dict lookup.
+        Setting or deleting an attribute anywhere in the configuration drops
+        the index, it is rebuilt by the next lookup. Changes inside lists
+        (e.g. config.items.append(...)) are not tracked.
+        :param str path: the dotted path of the value
+        :return: the value
+        """
+        if self._flat_index is None and self._indexed_root is self:
+            self._flat_index = self.__build_flat_index()
+        if self._flat_index is not None and path in self._flat_index:
+            return self._flat_index[path]
+        value = self
+        for k in path.split('.'):
+            value = getattr(value, k)
+        return value
+
     def validate(self):
         raise NotImplementedError()
+
+
+def _config_items(node):
+    if isinstance(node, BaseConfig):
+        return [
+            (k, v) for k, v in node.__dict__.items()
+            if k not in INTERNAL_FIELDS
+        ]
+    return node.items() if isinstance(node, dict) else None
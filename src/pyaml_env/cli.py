@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import sys
+from collections import OrderedDict
+
+import yaml
+
+from .config_template import ConfigTemplate
+from .dump_config import dump_config
+
+FORMATS = ('json', 'yaml')
+JSON_KEY_TYPES = (str, int, float, bool, type(None))
+OPTIONS = (
+    'tag', 'default_sep', 'default_value', 'raise_if_na', 'nested', 'encoding'
+)
+
+
+class Renderer:
+    """
+    Renders yaml configurations in a long-lived process. Every file is
+    parsed once into a ConfigTemplate, that is rendered against the
+    environment on every request, and only parsed again when it changes on
+    disk.
+    """
+
+    def __init__(self, maxsize=128, **options):
+        """
+        :param int maxsize: how many parsed files to keep, the least recently
+        used are dropped first
+        :param options: the default parse_config options, see OPTIONS
+        """
+        self.maxsize = maxsize
+        self.options = options
+        self._templates = OrderedDict()
+
+    def render(self, path=None, data=None, environ=None, **options):
+        """
+        :param str path: the path to the yaml file
+        :param str data: the yaml data itself, parsed without caching
+        :param environ: the variables to use, defaults to os.environ
+        :param options: parse_config options that override the defaults
+        :return: the configuration, as parse_config would return it
+        """
+        options = {**self.options, **options}
+        environ = os.environ if environ is None else environ
+        if path is None:
+            return ConfigTemplate(data=data, **options).render(environ)
+
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = (path, tuple(sorted(options.items())))
+        cached = self._templates.get(key)
+        if cached is None or cached[0] != version:
+            cached = self._templates[key] = (
+                version, ConfigTemplate(path=path, **options)
+            )
+            if len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+        self._templates.move_to_end(key)
+        return cached[1].render(environ)
+
+    def clear(self):
+        """
+        Drop all the parsed files
+        """
+        self._templates.clear()
+
+
+def format_config(config, output_format='json', indent=None):
+    """
+    :param config: the configuration
+    :param str output_format: json or yaml
+    :param int indent: the indentation of the json output, None for a single
+    line
+    :return: the configuration as text, keys and values that json does not
+    support (e.g. dates) are written as strings
+    :rtype: str
+    """
+    if output_format == 'yaml':
+        return dump_config(config)
+    return json.dumps(
+        _json_keys(config, set()), indent=indent, default=str,
+        ensure_ascii=False
+    )
+
+
+def _json_keys(value, in_progress):
+    """
+    Copy the mappings and sequences, with the keys that json does not
+    support, e.g. dates or tuples, converted to strings
+    """
+    if not isinstance(value, (dict, list)):
+        return value
+    if id(value) in in_progress:
+        raise ValueError('Recursive structures can not be written as json')
+    in_progress.add(id(value))
+    if isinstance(value, list):
+        result = [_json_keys(v, in_progress) for v in value]
+    else:
+        result = {
+            k if isinstance(k, JSON_KEY_TYPES) else str(k):
+                _json_keys(v, in_progress)
+            for k, v in value.items()
+        }
+    in_progress.discard(id(value))
+    return result
+
+
+def serve(renderer, requests, responses, output_format='json'):
+    """
+    Answer one request per line, until the end of the requests. A request is
+    either a path or a json object like
+    {"id": 1, "path": "config.yaml", "format": "yaml", "env": {"DB_HOST": "db"}}
+    with "data" instead of "path" for the yaml itself, and any of OPTIONS.
+    "env" is applied on top of os.environ.
+
+    Every answer is a single json line with the id and path of the request
+    and either the "config" (a string for the yaml format) or an "error".
+    :param Renderer renderer: renders the configurations
+    :param requests: the request lines, e.g. sys.stdin
+    :param responses: where to write the answers, e.g. sys.stdout
+    :param str output_format: json or yaml, if the request does not say
+    """
+    for line in requests:
+        line = line.strip()
+        if not line:
+            continue
+        response = {}
+        try:
+            request = json.loads(line) if line.startswith('{') \
+                else {'path': line}
+            for field in ('id', 'path'):
+                if field in request:
+                    response[field] = request[field]
+            request_format = request.pop('format', output_format)
+            if request_format not in FORMATS:
+                raise ValueError(f'Unknown format {request_format}')
+            environ = request.pop('env', None)
+            if environ is not None:
+                environ = {**os.environ, **environ}
+            request.pop('id', None)
+            path = request.pop('path', None)
+            data = request.pop('data', None)
+            unknown = sorted(set(request) - set(OPTIONS))
+            if unknown:
+                raise ValueError(f'Unknown options {", ".join(unknown)}')
+            config = renderer.render(path, data, environ, **request)
+            response['config'] = config if request_format == 'json' \
+                else format_config(config, request_format)
+            answer = format_config(response)
+        except Exception as e:
+            # one bad request must not stop the process
+            response.pop('config', None)
+            response['error'] = f'{e.__class__.__name__}: {e}'
+            answer = format_config(response)
+        responses.write(answer + '\n')
+        responses.flush()
+
+
+def main(argv=None):
+    """
+    The pyaml-env command: print the resolved configuration of yaml files,
+    or with --batch, answer requests from stdin, see serve.
+    :param list[str] argv: the arguments, defaults to sys.argv[1:]
+    :return: the exit status
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        prog='pyaml-env',
+        description='Resolve the environment variables in yaml files and '
+                    'print the configurations as json or yaml.'
+    )
+    parser.add_argument(
+        'paths', nargs='*', help='the yaml files, - to read from stdin'
+    )
+    parser.add_argument('-f', '--format', choices=FORMATS, default='json')
+    parser.add_argument(
+        '--indent', type=int, help='indent the json output by this much'
+    )
+    parser.add_argument('--tag', default='!ENV')
+    parser.add_argument(
+        '--untagged', action='store_true',
+        help='resolve the variables in all plain scalars (tag=None)'
+    )
+    parser.add_argument('--default-sep', default=':')
+    parser.add_argument('--default-value', default='N/A')
+    parser.add_argument('--raise-if-na', action='store_true')
+    parser.add_argument('--nested', action='store_true')
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument(
+        '--batch', action='store_true',
+        help='read paths or json requests from stdin, one per line, and '
+             'answer each with a json line, in one process'
+    )
+    args = parser.parse_args(argv)
+    if not args.paths and not args.batch:
+        parser.error('either paths or --batch is required')
+
+    renderer = Renderer(
+        tag=None if args.untagged else args.tag,
+        default_sep=args.default_sep,
+        default_value=args.default_value,
+        raise_if_na=args.raise_if_na,
+        nested=args.nested,
+        encoding=args.encoding,
+    )
+    if args.batch:
+        serve(renderer, sys.stdin, sys.stdout, args.format)
+        return 0
+
+    for i, path in enumerate(args.paths):
+        try:
+            if path == '-':
+                config = renderer.render(data=sys.stdin.read())
+            else:
+                config = renderer.render(path)
+            text = format_config(config, args.format, args.indent)
+        except (OSError, ValueError, TypeError, yaml.YAMLError) as e:
+            print(f'pyaml-env: {path}: {e}', file=sys.stderr)
+            return 1
+        if args.format == 'yaml' and i:
+            sys.stdout.write('---\n')
+        sys.stdout.write(text if text.endswith('\n') else text + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import hashlib
+from collections.abc import Mapping
+
+
+class HashedDict(dict):
+    """
+    A dict that carries the content hash of everything under it, see
+    hash_config
+    """
+    __slots__ = ('content_hash',)
+
+
+class HashedList(list):
+    """
+    A list that carries the content hash of everything under it, see
+    hash_config
+    """
+    __slots__ = ('content_hash',)
+
+
+def construct_hashed_map(loader, node):
+    data = HashedDict()
+    yield data
+    data.update(loader.construct_mapping(node))
+
+
+def construct_hashed_seq(loader, node):
+    data = HashedList()
+    yield data
+    data.extend(loader.construct_sequence(node))
+
+
+def hash_config(config):
+    """
+    Compute a content hash for every mapping and sequence in a configuration,
+    bottom-up, so that diff_config can skip identical subtrees. Mappings and
+    sequences that are not a HashedDict or HashedList yet are copied into
+    one. The hash of a mapping does not depend on the order of its keys.
+    :param config: the configuration, e.g. as returned by parse_config
+    :return: the configuration with HashedDict and HashedList containers
+    """
+    hashed = {}
+    in_progress = set()
+    stack = [(config, False)]
+    while stack:
+        node, children_hashed = stack.pop()
+        if id(node) in hashed or not isinstance(node, (Mapping, list)):
+            continue
+        children = list(node.values() if isinstance(node, Mapping) else node)
+        if not children_hashed:
+            if id(node) in in_progress:
+                raise ValueError('Recursive structures can not be hashed')
+            in_progress.add(id(node))
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+
+        in_progress.discard(id(node))
+        if isinstance(node, Mapping):
+            result = node if isinstance(node, HashedDict) else HashedDict(node)
+            digests = sorted(
+                _scalar_digest(k) + _digest(hashed, v) for k, v in node.items()
+            )
+            for k, v in result.items():
+                result[k] = hashed.get(id(v), (None, v))[1]
+            result.content_hash = _hash(b'd', digests)
+        else:
+            result = node if isinstance(node, HashedList) else HashedList(node)
+            for i, v in enumerate(result):
+                result[i] = hashed.get(id(v), (None, v))[1]
+            result.content_hash = _hash(
+                b'l', [_digest(hashed, v) for v in children]
+            )
+        hashed[id(node)] = (result.content_hash, result)
+    return hashed[id(config)][1] if id(config) in hashed else config
+
+
+def diff_config(old, new):
+    """
+    Compare two configurations and return the key paths that changed, e.g.
+    [('database', 'url'), ('tenants', 'acme')]. Subtrees with the same
+    content hash (see hash_config and parse_config(content_hashes=True)) are
+    skipped without looking into them, the rest are compared key by key.
+    Sequences of the same length are compared item by item, otherwise the
+    whole sequence is reported.
+    :param old: the previous configuration
+    :param new: the current configuration
+    :return: the paths of the keys that were added, removed or changed, ()
+    if the configurations differ at the root
+    :rtype: list[tuple]
+    """
+    changes = []
+    stack = [((), old, new)]
+    while stack:
+        path, a, b = stack.pop()
+        if a is b:
+            continue
+        a_hash = getattr(a, 'content_hash', None)
+        if a_hash is not None and a_hash == getattr(b, 'content_hash', None):
+            continue
+        if isinstance(a, Mapping) and isinstance(b, Mapping):
+            for k in reversed(list(b)):
+                if k not in a:
+                    changes.append(path + (k,))
+            for k in reversed(list(a)):
+                if k in b:
+                    stack.append((path + (k,), a[k], b[k]))
+                else:
+                    changes.append(path + (k,))
+        elif isinstance(a, list) and isinstance(b, list) \
+                and len(a) == len(b):
+            stack.extend(
+                (path + (i,), a[i], b[i]) for i in reversed(range(len(a)))
+            )
+        elif type(a) is not type(b) or a != b:
+            changes.append(path)
+    return changes
+
+
+def _digest(hashed, value):
+    if id(value) in hashed:
+        return hashed[id(value)][0]
+    return _scalar_digest(value)
+
+
+def _scalar_digest(value):
+    return _hash(b's', [type(value).__name__.encode(), repr(value).encode()])
+
+
+def _hash(kind, parts):
+    digest = hashlib.blake2b(kind, digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
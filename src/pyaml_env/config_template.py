@@ -0,0 +1,214 @@
+import multiprocessing
+
+import yaml
+
+from .dump_config import EnvTemplate
+from .parse_config import (
+    parse_config,
+    compile_env_pattern,
+    find_env_variables,
+    substitute_env_variables,
+    type_tag_pattern,
+)
+from .placeholders import NestedResolver, parse_placeholders
+
+
+class ConfigTemplate:
+    """
+    A yaml configuration that is parsed once and can then be rendered
+    against many sets of variables, e.g. one per tenant or environment.
+    Rendering only resolves the placeholders and copies the mappings and
+    sequences on the way to them, everything else is shared between the
+    rendered configurations, so they must be treated as read-only.
+    """
+
+    def __init__(
+            self,
+            path=None,
+            data=None,
+            tag='!ENV',
+            default_sep=':',
+            default_value='N/A',
+            raise_if_na=False,
+            loader=yaml.SafeLoader,
+            encoding='utf-8',
+            nested=False
+    ):
+        """
+        The arguments are the same as for parse_config.
+        """
+        self.loader = loader or yaml.SafeLoader
+        self.default_sep = default_sep or ''
+        self.default_value = default_value or ''
+        self.raise_if_na = raise_if_na
+        self.nested = nested
+        self.config = parse_config(
+            path=path,
+            data=data,
+            tag=tag,
+            default_sep=default_sep,
+            default_value=default_value,
+            raise_if_na=raise_if_na,
+            loader=self.loader,
+            encoding=encoding,
+            round_trip=True,
+            nested=nested
+        )
+        pattern = compile_env_pattern(self.default_sep)
+
+        def slot(keys, template):
+            dt = ''.join(type_tag_pattern.findall(template))
+            value = template.replace(dt, '')
+            if nested:
+                variables = parse_placeholders(value, self.default_sep)
+            else:
+                variables = find_env_variables(
+                    value, pattern, self.default_sep, self.default_value,
+                    raise_if_na
+                )
+            return keys, dt.strip(), value, variables
+
+        # the slots: the path to every placeholder, its type and variables,
+        # and the key slots: the path to every mapping with placeholders in
+        # its keys, deepest first, with the slot of every such key.
+        # Aliased containers are visited under every path they appear in,
+        # only the ones inside themselves are rejected.
+        self.slots = []
+        self.key_slots = []
+        in_progress = set()
+        stack = [((), self.config)]
+        while stack:
+            keys, node = stack.pop()
+            if keys is None:
+                # every value below the node has been visited
+                in_progress.discard(id(node))
+            elif isinstance(node, EnvTemplate):
+                self.slots.append(slot(keys, node.template))
+            elif isinstance(node, (dict, list)):
+                if id(node) in in_progress:
+                    raise ValueError(
+                        'Recursive structures can not be templated'
+                    )
+                in_progress.add(id(node))
+                stack.append((None, node))
+                if isinstance(node, dict):
+                    templated_keys = {
+                        k: slot(keys, k.template) for k in node
+                        if isinstance(k, EnvTemplate)
+                    }
+                    if templated_keys:
+                        self.key_slots.append((keys, templated_keys))
+                    stack.extend((keys + (k,), v) for k, v in node.items())
+                else:
+                    stack.extend((keys + (i,), v) for i, v in enumerate(node))
+        self.key_slots.sort(key=lambda key_slot: len(key_slot[0]), reverse=True)
+        self._constructor = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_constructor'] = None
+        return state
+
+    def render(self, environ):
+        """
+        Resolve the configuration against a set of variables
+        :param environ: the variables to use instead of os.environ, e.g.
+        {'DB_HOST': 'acme.db'}. Use {**os.environ, **variables} to fall back
+        to the environment.
+        :return: the configuration, as parse_config would return it
+        """
+        if not self.slots and not self.key_slots:
+            return self.config
+        resolver = NestedResolver(
+            self.default_sep, self.default_value, self.raise_if_na, environ
+        ) if self.nested else None
+        if self.slots and self.slots[0][0] == ():
+            return self._resolve(self.slots[0], environ, resolver)
+
+        root = _copy(self.config)
+        copies = {(): root}
+        for slot in self.slots:
+            keys = slot[0]
+            parent = _copy_path(root, copies, keys[:-1])
+            parent[keys[-1]] = self._resolve(slot, environ, resolver)
+        # the values below a mapping are resolved before its keys, and the
+        # deeper mappings before the ones they are in, so that the paths
+        # with the unresolved keys still lead to them
+        for keys, templated_keys in self.key_slots:
+            mapping = _copy_path(root, copies, keys)
+            resolved = {
+                self._resolve(templated_keys[k], environ, resolver)
+                if isinstance(k, EnvTemplate) else k: v
+                for k, v in mapping.items()
+            }
+            if keys:
+                _copy_path(root, copies, keys[:-1])[keys[-1]] = resolved
+            else:
+                root = resolved
+            copies[keys] = resolved
+        return root
+
+    def render_many(self, environs, processes=None, chunksize=16):
+        """
+        Render the configuration against every set of variables, yielding
+        the configurations in the same order.
+        :param environs: an iterable of variable mappings, see render
+        :param int processes: if set, render in a pool of that many
+        processes
+        :param int chunksize: how many renders to send to a process at once
+        :return: a generator of configurations
+        """
+        if not processes:
+            for environ in environs:
+                yield self.render(environ)
+            return
+        with multiprocessing.Pool(
+                processes, initializer=_init_worker, initargs=(self,)
+        ) as pool:
+            yield from pool.imap(_render_in_worker, environs, chunksize)
+
+    def _resolve(self, slot, environ, resolver):
+        _, dt, value, variables = slot
+        if not variables or variables == [value]:
+            return value
+        if resolver:
+            full_value = resolver.expand(variables)
+        else:
+            full_value = substitute_env_variables(value, variables, environ)
+        if not dt:
+            return full_value
+        if self._constructor is None:
+            self._constructor = self.loader('')
+        return self._constructor.yaml_constructors[dt](
+            self._constructor, yaml.ScalarNode(dt, full_value)
+        )
+
+
+def _copy(node):
+    return dict(node) if isinstance(node, dict) else list(node)
+
+
+def _copy_path(root, copies, keys):
+    """
+    :return: the copy of the container at the path, the containers on the
+    way to it are copied once per render
+    """
+    parent = root
+    for i in range(1, len(keys) + 1):
+        sub_keys = keys[:i]
+        if sub_keys not in copies:
+            copies[sub_keys] = parent[keys[i - 1]] = _copy(parent[keys[i - 1]])
+        parent = copies[sub_keys]
+    return parent
+
+
+_worker_template = None
+
+
+def _init_worker(template):
+    global _worker_template
+    _worker_template = template
+
+
+def _render_in_worker(environ):
+    return _worker_template.render(environ)
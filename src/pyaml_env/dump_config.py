@@ -0,0 +1,74 @@
+import yaml
+
+from .config_diff import HashedDict, HashedList
+
+
+class EnvTemplate:
+    """
+    A value that was resolved from environment variables, as returned by
+    parse_config(..., round_trip=True). It keeps the original template,
+    e.g. 'http://${DB_HOST:localhost}:${DB_PORT}', and its tag, so that
+    dump_config can write the placeholders back instead of the values.
+    """
+    __slots__ = ('tag', 'template', 'value')
+
+    def __init__(self, tag, template, value):
+        """
+        :param str tag: the tag of the node, e.g. !ENV, None if the
+        placeholder was resolved without a tag
+        :param str template: the unresolved value, including any
+        tag:yaml.org,2002:<datatype> prefix
+        :param value: the resolved value
+        """
+        self.tag = tag
+        self.template = template
+        self.value = value
+
+    def __eq__(self, other):
+        if not isinstance(other, EnvTemplate):
+            return NotImplemented
+        return (self.tag, self.template, self.value) == \
+            (other.tag, other.template, other.value)
+
+    def __hash__(self):
+        return hash((self.tag, self.template))
+
+    def __repr__(self):
+        return f'EnvTemplate({self.tag!r}, {self.template!r}, {self.value!r})'
+
+
+def represent_env_template(dumper, data):
+    return dumper.represent_scalar(
+        data.tag or 'tag:yaml.org,2002:str', data.template
+    )
+
+
+def dump_config(obj, stream=None, dumper=yaml.SafeDumper, **kwargs):
+    """
+    Dump a configuration, e.g. as loaded with
+    parse_config(..., round_trip=True), back to yaml. Any EnvTemplate values
+    are written as their original, unresolved placeholders with their tags,
+    e.g. `url: !ENV http://${DB_HOST:localhost}:${DB_PORT}`.
+
+    The output is emitted to the stream as it is serialized, the whole
+    document is never held in memory as a string.
+
+    :param obj: the configuration to dump
+    :param stream: where to write the yaml, if None the yaml is returned as
+    a str
+    :param Type[yaml.Dumper] dumper: Specify which dumper to use. Defaults to
+    yaml.SafeDumper
+    :param kwargs: any other keyword arguments are passed to yaml.dump, the
+    key order is kept by default (sort_keys=False)
+    :return: None or the yaml if no stream was given
+    :rtype: str
+    """
+    # subclass so that the representer does not leak into the dumper given
+    env_dumper = type(f'Env{dumper.__name__}', (dumper,), {})
+    env_dumper.add_representer(EnvTemplate, represent_env_template)
+    env_dumper.add_representer(HashedDict, env_dumper.represent_dict)
+    env_dumper.add_representer(HashedList, env_dumper.represent_list)
+    kwargs.setdefault('sort_keys', False)
+    kwargs.setdefault('default_flow_style', False)
+    kwargs.setdefault('allow_unicode', True)
+    return yaml.dump(obj, stream, Dumper=env_dumper, **kwargs)
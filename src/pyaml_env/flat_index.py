@@ -0,0 +1,117 @@
+import json
+import re
+from bisect import bisect_left
+from collections.abc import Mapping
+
+env_name_pattern = re.compile(r'[^0-9a-zA-Z_]')
+
+
+class FlatIndex(Mapping):
+    """
+    A flat, read-only index over a nested configuration, keyed by the full
+    dotted path of every value, e.g. {'a.b.c': value}, so that a lookup by
+    path is a single dict lookup instead of a walk through the nested dicts.
+    The keys are also kept sorted, so that all the values under a prefix
+    can be found with a binary search.
+    """
+
+    def __init__(self, config, sep='.', items=None):
+        """
+        :param dict config: the configuration to index, as returned by
+        parse_config. A configuration that is not a mapping, e.g. a list,
+        raises a ValueError, and so do recursive mappings.
+        :param str sep: the separator for the key paths
+        :param items: a function that returns the (key, value) pairs of a
+        node if it is a mapping and None otherwise, to index trees of other
+        types, e.g. BaseConfig. Defaults to the items of every Mapping.
+        """
+        items = items or _mapping_items
+        if config and items(config) is None:
+            raise ValueError(
+                f'Only mappings can be indexed, not {type(config).__name__}'
+            )
+        self.sep = sep
+        self._index = {}
+        in_progress = set()
+        stack = [('', config)] if config else []
+        while stack:
+            prefix, node = stack.pop()
+            if prefix is None:
+                # every value below the node has been indexed
+                in_progress.discard(id(node))
+                continue
+            node_items = list(items(node))
+            if not node_items and prefix:
+                # keep empty mappings, they would be lost otherwise
+                self._index[prefix[:-len(sep)]] = node
+                continue
+            in_progress.add(id(node))
+            stack.append((None, node))
+            for k, v in node_items:
+                key = f'{prefix}{k}'
+                if items(v) is not None:
+                    if id(v) in in_progress:
+                        raise ValueError(
+                            f'Recursive structures can not be indexed: {key}'
+                        )
+                    stack.append((key + sep, v))
+                else:
+                    self._index[key] = v
+        self._keys = sorted(self._index)
+
+    def __getitem__(self, path):
+        return self._index[path]
+
+    def __contains__(self, path):
+        return path in self._index
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._index!r})'
+
+    def with_prefix(self, prefix):
+        """
+        Get all the values under a prefix, e.g. with_prefix('a.b') returns
+        {'a.b.c': 1, 'a.b.d': 2}
+        :param str prefix: the key path of the subtree
+        :return: the values under the prefix, keyed by their full path
+        :rtype: dict[str, T]
+        """
+        result = {}
+        if prefix in self._index:
+            result[prefix] = self._index[prefix]
+        prefix = prefix + self.sep
+        for i in range(bisect_left(self._keys, prefix), len(self._keys)):
+            key = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            result[key] = self._index[key]
+        return result
+
+    def to_env(self, prefix='', sep='__'):
+        """
+        Export the index as environment variables, e.g. 'a.b.c' becomes
+        'A__B__C', to be passed on to child processes. Characters that are
+        not valid in environment variable names are replaced by '_', and
+        values that are not strings are converted to json.
+        :param str prefix: a prefix for every variable name, e.g. 'APP__'
+        :param str sep: the separator to use instead of the key separator
+        :return: the environment variables
+        :rtype: dict[str, str]
+        """
+        return {
+            prefix + sep.join(
+                env_name_pattern.sub('_', part).upper()
+                for part in key.split(self.sep)
+            ): value if isinstance(value, str) else json.dumps(value, default=str)
+            for key, value in self._index.items()
+        }
+
+
+def _mapping_items(node):
+    return node.items() if isinstance(node, Mapping) else None
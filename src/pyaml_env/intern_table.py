@@ -0,0 +1,56 @@
+class InternTable:
+    """
+    Keeps one copy of every short string, so that many configurations parsed
+    with parse_config(..., intern_table=table) share their keys and repeated
+    values (e.g. host names, regions or default values) instead of each
+    holding its own copies. Share one table across the calls.
+
+    The table is bounded: once it holds maxsize strings, new strings are no
+    longer added, the ones already in it are still shared. Use clear to
+    start over.
+    """
+
+    def __init__(self, maxsize=100000, max_length=64):
+        """
+        :param int maxsize: the most strings to keep
+        :param int max_length: longer strings are not interned
+        """
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self._table = {}
+
+    def intern(self, value):
+        """
+        :param value: any value, only str values are interned
+        :return: the copy of the value in the table, or the value itself
+        """
+        if type(value) is not str or len(value) > self.max_length:
+            return value
+        interned = self._table.get(value)
+        if interned is not None:
+            return interned
+        if len(self._table) >= self.maxsize:
+            return value
+        return self._table.setdefault(value, value)
+
+    def clear(self):
+        """
+        Drop all the strings, the configurations keep theirs
+        """
+        self._table.clear()
+
+    def __len__(self):
+        return len(self._table)
+
+    def __contains__(self, value):
+        return value in self._table
+
+
+def interning_constructor(intern_table):
+    """
+    :param InternTable intern_table: the table to intern into
+    :return: a constructor for tag:yaml.org,2002:str that interns the values
+    """
+    def construct_interned_str(loader, node):
+        return intern_table.intern(loader.construct_scalar(node))
+    return construct_interned_str
@@ -0,0 +1,208 @@
+from typing import NamedTuple, Optional
+
+import yaml
+
+
+class ParseLimitExceeded(ValueError):
+    """
+    Raised when a yaml document exceeds one of the configured ParseLimits
+    """
+
+
+class ParseLimits(NamedTuple):
+    """
+    Upper bounds for the documents parse_config accepts, so that a malformed
+    or malicious file (e.g. an alias bomb) fails fast instead of stalling
+    the process. None means no limit.
+
+    :param int max_nodes: the maximum number of nodes in a document,
+    counting every node an alias expands to
+    :param int max_depth: the maximum nesting depth of mappings and
+    sequences in a document
+    :param int max_alias_expansions: the maximum number of aliases
+    :param int max_document_bytes: the maximum size of the input in bytes
+    """
+    max_nodes: Optional[int] = None
+    max_depth: Optional[int] = None
+    max_alias_expansions: Optional[int] = None
+    max_document_bytes: Optional[int] = None
+
+
+class LimitedComposerMixin:
+    """
+    Enforces the ParseLimits while the node graph is composed, i.e. before
+    any python object is constructed.
+    """
+    parse_limits = ParseLimits()
+
+    def compose_document(self):
+        self._node_count = 0
+        self._depth = 0
+        self._alias_count = 0
+        self._anchor_sizes = {}
+        return super().compose_document()
+
+    def compose_node(self, parent, index):
+        limits = self.parse_limits
+        event = self.peek_event()
+        if isinstance(event, yaml.AliasEvent):
+            node = super().compose_node(parent, index)
+            self._alias_count += 1
+            if limits.max_alias_expansions is not None \
+                    and self._alias_count > limits.max_alias_expansions:
+                raise ParseLimitExceeded(
+                    f'Document exceeds max_alias_expansions='
+                    f'{limits.max_alias_expansions} {event.start_mark}'
+                )
+            self._count_nodes(self._anchor_sizes.get(event.anchor, 1), event)
+            return node
+
+        is_collection = isinstance(event, yaml.CollectionStartEvent)
+        if is_collection:
+            self._depth += 1
+            if limits.max_depth is not None \
+                    and self._depth > limits.max_depth:
+                raise ParseLimitExceeded(
+                    f'Document exceeds max_depth={limits.max_depth} '
+                    f'{event.start_mark}'
+                )
+        start = self._node_count
+        self._count_nodes(1, event)
+        node = super().compose_node(parent, index)
+        if is_collection:
+            self._depth -= 1
+        if event.anchor is not None:
+            self._anchor_sizes[event.anchor] = self._node_count - start
+        return node
+
+    def _count_nodes(self, count, event):
+        self._node_count += count
+        max_nodes = self.parse_limits.max_nodes
+        if max_nodes is not None and self._node_count > max_nodes:
+            raise ParseLimitExceeded(
+                f'Document exceeds max_nodes={max_nodes} {event.start_mark}'
+            )
+
+
+class NodeGraphLimitsMixin:
+    """
+    Enforces the ParseLimits on the composed node graph, before any python
+    object is constructed, for the loaders that compose in C (e.g.
+    yaml.CSafeLoader) and never call compose_node. Aliases are shared nodes
+    in the graph, so an alias bomb is still small at this point.
+    """
+    parse_limits = ParseLimits()
+
+    def get_single_node(self):
+        node = super().get_single_node()
+        if node is not None:
+            check_node_limits(node, self.parse_limits)
+        return node
+
+
+def check_node_limits(root, limits):
+    """
+    Count the nodes of a composed document, as if every alias was expanded,
+    its depth and its aliases, bottom-up and without recursion
+    :param yaml.Node root: the root node of the document
+    :param ParseLimits limits: the limits to enforce
+    """
+    # the expanded node count and the depth below every node
+    sizes = {}
+    in_progress = set()
+    references = 1
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if isinstance(node, yaml.MappingNode):
+            children = [child for pair in node.value for child in pair]
+        elif isinstance(node, yaml.SequenceNode):
+            children = node.value
+        else:
+            children = []
+        if not children_done:
+            if id(node) in sizes or id(node) in in_progress:
+                continue
+            in_progress.add(id(node))
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+
+        in_progress.discard(id(node))
+        references += len(children)
+        # an alias of a node that contains it counts as a single node
+        nodes = 1 + sum(sizes.get(id(child), (1, 0))[0] for child in children)
+        depth = max(
+            (sizes.get(id(child), (1, 0))[1] for child in children), default=0
+        ) + (1 if isinstance(node, yaml.CollectionNode) else 0)
+        sizes[id(node)] = (nodes, depth)
+        if limits.max_nodes is not None and nodes > limits.max_nodes:
+            raise ParseLimitExceeded(
+                f'Document exceeds max_nodes={limits.max_nodes} '
+                f'{node.start_mark}'
+            )
+        if limits.max_depth is not None and depth > limits.max_depth:
+            raise ParseLimitExceeded(
+                f'Document exceeds max_depth={limits.max_depth} '
+                f'{node.start_mark}'
+            )
+
+    # every reference to a node after the first one is an alias
+    aliases = references - len(sizes)
+    if limits.max_alias_expansions is not None \
+            and aliases > limits.max_alias_expansions:
+        raise ParseLimitExceeded(
+            f'Document exceeds max_alias_expansions='
+            f'{limits.max_alias_expansions} {root.start_mark}'
+        )
+
+
+def limited_loader(loader, limits):
+    """
+    Create a subclass of the loader that enforces the limits, while the
+    document is composed for the python loaders, and on the composed
+    document for the C loaders
+    :param Type[yaml.loader] loader: the loader to extend
+    :param ParseLimits limits: the limits to enforce
+    :return: the new loader class
+    """
+    mixin = LimitedComposerMixin \
+        if issubclass(loader, yaml.composer.Composer) else NodeGraphLimitsMixin
+    return type(
+        f'Limited{loader.__name__}',
+        (mixin, loader),
+        {'parse_limits': limits}
+    )
+
+
+def read_limited(data, limits, encoding='utf-8'):
+    """
+    Check the size of the input against limits.max_document_bytes. Streams
+    are read up to the limit, so the whole input is never held in memory if
+    it is too large.
+    :param data: the yaml data as a str, bytes or a stream
+    :param ParseLimits limits: the limits to enforce
+    :param str encoding: the encoding to measure str data with
+    :return: the data, read into memory if it was a stream
+    """
+    if limits.max_document_bytes is None:
+        return data
+    if hasattr(data, 'read'):
+        data = data.read(limits.max_document_bytes + 1)
+    check_document_bytes(
+        len(data.encode(encoding)) if isinstance(data, str) else len(data),
+        limits
+    )
+    return data
+
+
+def check_document_bytes(size, limits):
+    """
+    :param int size: the size of the input in bytes
+    :param ParseLimits limits: the limits to enforce
+    """
+    max_bytes = limits.max_document_bytes
+    if max_bytes is not None and size > max_bytes:
+        raise ParseLimitExceeded(
+            f'Document of {size} bytes exceeds max_document_bytes={max_bytes}'
+        )
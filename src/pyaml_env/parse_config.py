@@ -1,7 +1,139 @@
 import os
 import re
+from functools import lru_cache
+
 import yaml
 
+from .config_diff import construct_hashed_map, construct_hashed_seq, hash_config
+from .dump_config import EnvTemplate
+from .flat_index import FlatIndex
+from .intern_table import interning_constructor
+from .limits import check_document_bytes, limited_loader, read_limited
+from .placeholders import NestedResolver
+from .providers import ProvidedValues
+
+# For inner type conversions because double tags do not work, e.g. !ENV !!float
+type_tag = 'tag:yaml.org,2002:'
+type_tag_pattern = re.compile(f'({type_tag}\\w+\\s)')
+
+
+@lru_cache(maxsize=32)
+def compile_env_pattern(default_sep):
+    """
+    Compiled once per separator and shared by every parse
+    :param str default_sep: the separator of the default values, '' for none
+    :return: the pattern that finds the environment variables in a value
+    :rtype: re.Pattern
+    """
+    default_sep_pattern = r'(' + default_sep + '[^}]+)?' if default_sep else ''
+    return re.compile(
+        r'.*?\$\{([^}{' + default_sep + r']+)' + default_sep_pattern + r'\}.*?')
+
+
+def find_env_variables(value, pattern, default_sep, default_value, raise_if_na):
+    """
+    Find the environment variables in a value
+    :param str value: the value of the yaml node
+    :param re.Pattern pattern: the pattern from compile_env_pattern
+    :param str default_sep: the separator of the default values, '' for none
+    :param str default_value: the value to use if a variable has no default
+    :param bool raise_if_na: raise an exception if there is no default
+    value set for a variable.
+    :return: the placeholder, the variable name and the default value of every
+    variable, e.g. [('${DB_PORT:5432}', 'DB_PORT', '5432')]
+    :rtype: list[tuple[str, str, str]]
+    """
+    variables = []
+    for g in pattern.findall(value):
+        curr_default_value = default_value
+        env_var_name = g
+        env_var_name_with_default = g
+        if default_sep and isinstance(g, tuple) and len(g) > 1:
+            env_var_name = g[0]
+            env_var_name_with_default = ''.join(g)
+            found = False
+            for each in g:
+                if default_sep in each:
+                    _, curr_default_value = each.split(default_sep, 1)
+                    found = True
+                    break
+            if not found and raise_if_na:
+                raise ValueError(
+                    f'Could not find default value for {env_var_name}'
+                )
+        variables.append(
+            (f'${{{env_var_name_with_default}}}', env_var_name, curr_default_value)
+        )
+    return variables
+
+
+def substitute_env_variables(value, variables, environ):
+    """
+    :param str value: the value of the yaml node
+    :param variables: the variables as returned by find_env_variables
+    :param environ: the environment variables, e.g. os.environ
+    :return: the value with every variable replaced
+    :rtype: str
+    """
+    for placeholder, env_var_name, curr_default_value in variables:
+        value = value.replace(
+            placeholder, environ.get(env_var_name, curr_default_value)
+        )
+    return value
+
+
+class EnvResolverMixin:
+    """
+    Resolves plain scalars with environment variables to the None tag when
+    parse_config is used with tag=None. The cheap '${' check runs first, so
+    every other scalar goes straight to the loader's own implicit resolvers.
+    """
+    env_pattern = None
+
+    def resolve(self, kind, value, implicit):
+        if kind is yaml.ScalarNode and implicit[0] and '${' in value \
+                and self.env_pattern.match(value):
+            return None
+        return super().resolve(kind, value, implicit)
+
+
+def find_provider_references(root, tag, pattern, default_sep, providers):
+    """
+    Collect the placeholders of the providers in a composed yaml document,
+    before it is constructed, e.g. ('file', '/run/secrets/db_pass') for
+    ${file:/run/secrets/db_pass}
+    :param yaml.Node root: the root node of the document
+    :param str tag: the tag to look for, see parse_config
+    :param re.Pattern pattern: the pattern from compile_env_pattern
+    :param str default_sep: the separator of the default values
+    :param dict providers: the providers by name
+    :return: the (provider name, key) pairs
+    :rtype: set[tuple[str, str]]
+    """
+    references = set()
+    seen = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, yaml.MappingNode):
+            for key_node, value_node in node.value:
+                stack.extend((key_node, value_node))
+        elif isinstance(node, yaml.SequenceNode):
+            stack.extend(node.value)
+        elif '${' in node.value and (
+                node.tag == tag if tag is not None else
+                node.tag is None or not node.tag.startswith(type_tag)
+        ):
+            references.update(
+                (name, key) for _, name, key in find_env_variables(
+                    node.value, pattern, default_sep, None, False
+                ) if name in providers and key is not None
+            )
+    return references
+
 
 def parse_config(
         path=None,
@@ -11,7 +143,14 @@ def parse_config(
         default_value='N/A',
         raise_if_na=False,
         loader=yaml.SafeLoader,
-        encoding='utf-8'
+        encoding='utf-8',
+        limits=None,
+        round_trip=False,
+        flatten=False,
+        nested=False,
+        providers=None,
+        content_hashes=False,
+        intern_table=None
 ):
     """
         Load yaml configuration from path or from the contents of a file (data)
@@ -27,8 +166,8 @@ def parse_config(
 
         :param str path: the path to the yaml file
         :param str data: the yaml data itself as a stream
-        :param str tag: the tag to look for, if None, all env variables will be
-        resolved.
+        :param str tag: the tag to look for, if None, all env variables in
+        plain scalars will be resolved, and in scalars with unknown tags.
         :param str default_sep: if any default values are set, use this field
         to separate them from the enironment variable name. E.g. ':' can be
         used.
@@ -36,26 +175,70 @@ def parse_config(
         :param bool raise_if_na: raise an exception if there is no default
         value set for the env variable.
         :param Type[yaml.loader] loader: Specify which loader to use. Defaults to
-        yaml.SafeLoader
+        yaml.SafeLoader. The loader itself is not modified, so parse_config
+        can be called from many threads at once with different options.
         :param str encoding: the encoding of the data if a path is specified,
         defaults to utf-8
+        :param ParseLimits limits: fail with a ParseLimitExceeded error if the
+        document is larger, deeper or expands more aliases than allowed.
+        Defaults to no limits.
+        :param bool round_trip: return every resolved value as an EnvTemplate
+        that also keeps the original placeholders and tag, so that the
+        configuration can be written back with dump_config.
+        :param bool flatten: return a FlatIndex over the configuration,
+        keyed by the dotted path of every value, e.g. {'a.b.c': value}
+        :param bool nested: allow placeholders in default values, e.g.
+        ${DB_HOST:${FALLBACK_HOST:localhost}}, and resolve placeholders in the
+        values of the environment variables, e.g. URL=http://${HOST}:${PORT}.
+        Circular references raise a ValueError.
+        :param dict[str, Provider] providers: resolve placeholders like
+        ${file:/run/secrets/db_pass} with the provider registered by that
+        name, e.g. {'file': FileProvider()}, instead of the environment. The
+        keys of every provider in the document are fetched at once, before
+        the document is constructed. Can not be used with nested.
+        :param bool content_hashes: build every mapping as a HashedDict and
+        every sequence as a HashedList, with the content hash of everything
+        under it, so that diff_config can skip the subtrees that did not
+        change between two parses.
+        :param InternTable intern_table: intern the keys, the string values
+        and the resolved values in this table, so that the configurations
+        parsed with the same table share one copy of every repeated string.
         :return: the dict configuration
         :rtype: dict[str, T]
         """
     default_sep = default_sep or ''
     default_value = default_value or ''
-    default_sep_pattern = r'(' + default_sep + '[^}]+)?' if default_sep else ''
-    pattern = re.compile(
-        r'.*?\$\{([^}{' + default_sep + r']+)' + default_sep_pattern + r'\}.*?')
+    pattern = compile_env_pattern(default_sep)
     loader = loader or yaml.SafeLoader
 
-    # the tag will be used to mark where to start searching for the pattern
-    # e.g. a_key: !ENV somestring${ENV_VAR}other_stuff_follows
-    loader.add_implicit_resolver(tag, pattern, first=[tag])
+    # register everything on a subclass per call, so that concurrent calls
+    # with different options do not overwrite each other's constructors
+    if tag is None:
+        # every plain scalar is checked for environment variables
+        loader = type(
+            f'Env{loader.__name__}',
+            (EnvResolverMixin, loader),
+            {'env_pattern': pattern}
+        )
+    else:
+        loader = type(f'Env{loader.__name__}', (loader,), {})
+        # the tag will be used to mark where to start searching for the pattern
+        # e.g. a_key: !ENV somestring${ENV_VAR}other_stuff_follows
+        loader.add_implicit_resolver(tag, pattern, first=[tag])
 
-    # For inner type conversions because double tags do not work, e.g. !ENV !!float
-    type_tag = 'tag:yaml.org,2002:'
-    type_tag_pattern = re.compile(f'({type_tag}\w+\s)')
+    # every placeholder is resolved once per parse, aliased nodes and
+    # repeated values share the result
+    resolved = {}
+    nested_resolver = NestedResolver(
+        default_sep, default_value, raise_if_na, os.environ
+    ) if nested else None
+    environ = os.environ
+    if providers:
+        if nested:
+            raise ValueError('providers can not be used with nested=True')
+        environ = ProvidedValues(
+            providers, os.environ, default_value, raise_if_na
+        )
 
     def constructor_env_variables(loader, node):
         """
@@ -68,47 +251,85 @@ def parse_config(
         default_value='N/A'
         """
         value = loader.construct_scalar(node)
-        match = pattern.findall(value)  # to find all env variables in line
+        key = (node.tag, value)
+        if key not in resolved:
+            resolved[key] = resolve_env_variables(loader, node, value)
+            if intern_table is not None:
+                resolved[key] = intern_table.intern(resolved[key])
+        if round_trip:
+            # a template per node, so that nodes with the same placeholders
+            # can be edited on their own and are not dumped as aliases
+            return EnvTemplate(key[0], value, resolved[key])
+        return resolved[key]
+
+    def resolve_env_variables(loader, node, value):
         dt = ''.join(type_tag_pattern.findall(value)) or ''
         value = value.replace(dt, '')
-        if match:
-            full_value = value
-            for g in match:
-                curr_default_value = default_value
-                env_var_name = g
-                env_var_name_with_default = g
-                if default_sep and isinstance(g, tuple) and len(g) > 1:
-                    env_var_name = g[0]
-                    env_var_name_with_default = ''.join(g)
-                    found = False
-                    for each in g:
-                        if default_sep in each:
-                            _, curr_default_value = each.split(default_sep, 1)
-                            found = True
-                            break
-                    if not found and raise_if_na:
-                        raise ValueError(
-                            f'Could not find default value for {env_var_name}'
-                        )
-                full_value = full_value.replace(
-                    f'${{{env_var_name_with_default}}}',
-                    os.environ.get(env_var_name, curr_default_value)
-                )
-                if dt:
-                    # do one more roundtrip with the dt constructor:
-                    node.value = full_value
-                    node.tag = dt.strip()
-                    return loader.yaml_constructors[node.tag](loader, node)
-            return full_value
-
-        return value
+        if nested_resolver:
+            if '${' not in value:
+                return value
+            full_value = nested_resolver.resolve(value)
+        else:
+            # to find all env variables in line
+            variables = find_env_variables(
+                value, pattern, default_sep, default_value, raise_if_na
+            )
+            if not variables:
+                return value
+            full_value = substitute_env_variables(value, variables, environ)
+        if dt:
+            # do one more roundtrip with the dt constructor:
+            node.value = full_value
+            node.tag = dt.strip()
+            return loader.yaml_constructors[node.tag](loader, node)
+        return full_value
 
     loader.add_constructor(tag, constructor_env_variables)
+    if intern_table is not None:
+        loader.add_constructor(
+            'tag:yaml.org,2002:str', interning_constructor(intern_table)
+        )
+    if content_hashes and issubclass(loader, yaml.constructor.SafeConstructor):
+        loader.add_constructor(
+            'tag:yaml.org,2002:map', construct_hashed_map
+        )
+        loader.add_constructor(
+            'tag:yaml.org,2002:seq', construct_hashed_seq
+        )
+    if limits:
+        loader = limited_loader(loader, limits)
+
+    def load(stream):
+        if not providers:
+            return yaml.load(stream, Loader=loader)
+        env_loader = loader(stream)
+        try:
+            node = env_loader.get_single_node()
+            if node is None:
+                return None
+            environ.fetch(find_provider_references(
+                node, tag, pattern, default_sep, providers
+            ))
+            return env_loader.construct_document(node)
+        finally:
+            env_loader.dispose()
 
     if path:
+        if limits:
+            check_document_bytes(os.path.getsize(path), limits)
         with open(path, encoding=encoding) as conf_data:
-            return yaml.load(conf_data, Loader=loader)
+            config = load(conf_data)
     elif data:
-        return yaml.load(data, Loader=loader)
+        if limits:
+            data = read_limited(data, limits, encoding)
+        config = load(data)
     else:
         raise ValueError('Either a path or data should be defined as input')
+
+    if content_hashes:
+        # the containers are built by the loader, their hashes are computed
+        # bottom-up once the values are resolved
+        config = hash_config(config)
+    if flatten:
+        return FlatIndex(config)
+    return config
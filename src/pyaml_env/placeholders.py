@@ -0,0 +1,133 @@
+def parse_placeholders(value, default_sep):
+    """
+    Split a value into literal strings and placeholders, where the default
+    value of a placeholder can contain more placeholders, e.g.
+    'http://${HOST:${FALLBACK_HOST:localhost}}' becomes
+    ['http://', ('HOST', [('FALLBACK_HOST', ['localhost'])])]
+    Only '${' starts a nested placeholder, any other '{' is kept as is.
+    :param str value: the value of the yaml node
+    :param str default_sep: the separator of the default values, '' for none
+    :return: the literal strings and the (name, default) of every
+    placeholder, default is None if there is no default value
+    :rtype: list
+    """
+    segments, _ = _parse(value, 0, default_sep, in_default=False)
+    return segments
+
+
+def _parse(value, i, default_sep, in_default):
+    segments = []
+    literal_start = i
+    while i < len(value):
+        if value.startswith('${', i):
+            placeholder, end = _parse_placeholder(value, i, default_sep)
+            if placeholder is None:
+                i += 2
+                continue
+            if literal_start < i:
+                segments.append(value[literal_start:i])
+            segments.append(placeholder)
+            i = literal_start = end
+        elif in_default and value[i] == '}':
+            break
+        else:
+            i += 1
+    if literal_start < i:
+        segments.append(value[literal_start:i])
+    return segments, i
+
+
+def _parse_placeholder(value, i, default_sep):
+    start = end = i + 2
+    while end < len(value) and value[end] not in '{}' and \
+            not (default_sep and value.startswith(default_sep, end)):
+        end += 1
+    if end == start or end == len(value) or value[end] == '{':
+        return None, i
+    name = value[start:end]
+    if value[end] == '}':
+        return (name, None), end + 1
+    default, end = _parse(value, end + len(default_sep), default_sep, True)
+    if end == len(value):
+        # unterminated, not a placeholder
+        return None, i
+    return (name, default), end + 1
+
+
+class NestedResolver:
+    """
+    Resolves placeholders with nested default values, e.g.
+    ${DB_HOST:${FALLBACK_HOST:localhost}}, and environment variables whose
+    values reference other variables, e.g. URL=http://${HOST}:${PORT}.
+    Every variable is looked up and expanded once and then reused, so a
+    resolver should only live as long as a single parse.
+    """
+
+    def __init__(self, default_sep, default_value, raise_if_na, environ):
+        """
+        :param str default_sep: the separator of the default values
+        :param str default_value: the value to use if a variable is not set
+        and has no default
+        :param bool raise_if_na: raise an exception if there is no default
+        value set for a variable.
+        :param environ: the environment variables, e.g. os.environ
+        """
+        self.default_sep = default_sep
+        self.default_value = default_value
+        self.raise_if_na = raise_if_na
+        self.environ = environ
+        self._variables = {}
+        self._in_progress = set()
+
+    def resolve(self, value):
+        """
+        :param str value: the value of the yaml node
+        :return: the value with every placeholder resolved
+        :rtype: str
+        """
+        return self.expand(parse_placeholders(value, self.default_sep))
+
+    def expand(self, segments):
+        """
+        :param list segments: the value as returned by parse_placeholders
+        :return: the value with every placeholder resolved
+        :rtype: str
+        """
+        parts = []
+        for segment in segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            name, default = segment
+            if default is None and self.raise_if_na:
+                raise ValueError(f'Could not find default value for {name}')
+            value = self.variable(name)
+            if value is None:
+                value = self.default_value if default is None \
+                    else self.expand(default)
+            parts.append(value)
+        return ''.join(parts)
+
+    def variable(self, name):
+        """
+        Get the value of an environment variable, with any placeholders in it
+        resolved.
+        :param str name: the name of the environment variable
+        :return: the value or None if the variable is not set
+        :rtype: str
+        """
+        if name in self._variables:
+            return self._variables[name]
+        if name in self._in_progress:
+            raise ValueError(
+                f'Circular reference in environment variable {name}'
+            )
+        value = self.environ.get(name)
+        if value is not None and '${' in value:
+            self._in_progress.add(name)
+            try:
+                value = self.resolve(value)
+            finally:
+                self._in_progress.discard(name)
+        self._variables[name] = value
+        return value
@@ -0,0 +1,128 @@
+import threading
+import time
+
+
+class Provider:
+    """
+    A source of values other than the environment variables, e.g. a secret
+    store, for placeholders like ${file:/run/secrets/db_pass}, where `file`
+    is the name the provider is registered with in parse_config(providers=...)
+    and the rest is the key to look up.
+
+    parse_config collects all the keys of a provider in a document first and
+    then fetches them with a single call to fetch_many. The values are cached
+    in the provider for `ttl` seconds, so reuse the provider across parses.
+    """
+
+    def __init__(self, ttl=60):
+        """
+        :param float ttl: how long to cache the values for, in seconds. None
+        caches them forever, 0 disables caching.
+        """
+        self.ttl = ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def fetch_many(self, keys):
+        """
+        Fetch the values of many keys at once, to be implemented by the
+        subclasses
+        :param list[str] keys: the keys to fetch
+        :return: the values, keys that were not found are left out
+        :rtype: dict[str, str]
+        """
+        raise NotImplementedError()
+
+    def get_many(self, keys):
+        """
+        Get the values of many keys, from the cache if they have not expired
+        and with one fetch_many call for the rest
+        :param keys: the keys to get
+        :return: the values, keys that were not found are left out
+        :rtype: dict[str, str]
+        """
+        now = time.monotonic()
+        values = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                cached = self._cache.get(key)
+                if cached and (cached[1] is None or cached[1] > now):
+                    values[key] = cached[0]
+                else:
+                    missing.append(key)
+        if missing:
+            fetched = self.fetch_many(missing)
+            if self.ttl != 0:
+                expires = None if self.ttl is None else now + self.ttl
+                with self._lock:
+                    for key, value in fetched.items():
+                        self._cache[key] = (value, expires)
+            values.update(fetched)
+        return values
+
+    def clear(self):
+        """
+        Drop all the cached values
+        """
+        with self._lock:
+            self._cache.clear()
+
+
+class FileProvider(Provider):
+    """
+    Reads the value from the file the key points to, e.g. docker or
+    kubernetes secrets: ${file:/run/secrets/db_pass}. A trailing newline is
+    stripped.
+    """
+
+    def __init__(self, ttl=60, encoding='utf-8'):
+        super().__init__(ttl)
+        self.encoding = encoding
+
+    def fetch_many(self, keys):
+        values = {}
+        for key in keys:
+            try:
+                with open(key, encoding=self.encoding) as value_file:
+                    values[key] = value_file.read().rstrip('\n')
+            except FileNotFoundError:
+                continue
+        return values
+
+
+class ProvidedValues:
+    """
+    Looks up the values of the providers in place of the environment
+    variables, for substitute_env_variables. For a provider placeholder the
+    default value is the key, e.g. ${file:/run/secrets/db_pass}
+    """
+
+    def __init__(self, providers, environ, default_value, raise_if_na):
+        self.providers = providers
+        self.environ = environ
+        self.default_value = default_value
+        self.raise_if_na = raise_if_na
+        self.values = {}
+
+    def fetch(self, references):
+        """
+        :param references: the (provider name, key) pairs to fetch, with one
+        get_many call per provider
+        """
+        keys = {}
+        for name, key in references:
+            keys.setdefault(name, set()).add(key)
+        for name, provider_keys in keys.items():
+            for key, value in self.providers[name].get_many(
+                    sorted(provider_keys)).items():
+                self.values[(name, key)] = value
+
+    def get(self, name, default=None):
+        if name not in self.providers:
+            return self.environ.get(name, default)
+        if (name, default) in self.values:
+            return self.values[(name, default)]
+        if self.raise_if_na:
+            raise ValueError(f'Could not find {default} in provider {name}')
+        return self.default_value
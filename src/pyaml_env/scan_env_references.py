@@ -0,0 +1,163 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import NamedTuple, Optional, Tuple
+
+import yaml
+
+from .parse_config import compile_env_pattern, find_env_variables
+from .placeholders import parse_placeholders
+
+
+class EnvReference(NamedTuple):
+    """
+    An environment variable referenced in a yaml configuration. `within`
+    holds the variables whose default value it is nested in, outermost
+    first, e.g. ('A',) for B in ${A:${B}}: it is only read if none of them
+    is set.
+    """
+    name: str
+    default: Optional[str]
+    line: int
+    column: int
+    path: Optional[str] = None
+    within: Tuple[str, ...] = ()
+
+
+def scan_env_references(
+        path=None,
+        data=None,
+        tag='!ENV',
+        default_sep=':',
+        loader=yaml.SafeLoader,
+        encoding='utf-8',
+        nested=False
+):
+    """
+    List the environment variables a yaml configuration references, without
+    loading it: only the yaml event stream is read, no nodes or objects are
+    constructed and no variables are resolved.
+
+    :param str path: the path to the yaml file
+    :param str data: the yaml data itself as a stream
+    :param str tag: the tag to look for, if None, the plain scalars and the
+    scalars with unknown tags are scanned, as parse_config does
+    :param str default_sep: the separator of the default values
+    :param Type[yaml.loader] loader: Specify which loader to use. Defaults to
+    yaml.SafeLoader
+    :param str encoding: the encoding of the data if a path is specified,
+    defaults to utf-8
+    :param bool nested: scan for nested placeholders, see parse_config
+    :return: every reference, with its default value (None if there is none)
+    and the line and column (1-based) of the scalar it is in
+    :rtype: list[EnvReference]
+    """
+    if path:
+        with open(path, encoding=encoding) as conf_data:
+            return _scan(conf_data, tag, default_sep, loader, nested, path)
+    elif data:
+        return _scan(data, tag, default_sep, loader, nested, None)
+    raise ValueError('Either a path or data should be defined as input')
+
+
+def find_missing_env_references(
+        paths,
+        environ=None,
+        processes=None,
+        **kwargs
+):
+    """
+    Scan many yaml files and report every referenced environment variable
+    that is neither set nor has a default value, in one pass. A variable
+    nested in the default value of others, e.g. B in ${A:${B}}, is only
+    reported if none of those are set either.
+
+    :param paths: the paths to the yaml files
+    :param environ: the environment to check against, defaults to os.environ
+    :param int processes: if set, scan the files in a pool of that many
+    processes
+    :param kwargs: any other keyword arguments are passed to
+    scan_env_references
+    :return: the missing references of every file that has any
+    :rtype: dict[str, list[EnvReference]]
+    """
+    environ = os.environ if environ is None else environ
+    scan = partial(_scan_path, **kwargs)
+    paths = list(paths)
+    if processes:
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(
+                scan, paths, chunksize=max(1, len(paths) // (processes * 4))
+            ))
+    else:
+        results = map(scan, paths)
+
+    missing = {}
+    for path, references in zip(paths, results):
+        references = [
+            r for r in references
+            if r.default is None and r.name not in environ
+            and not any(name in environ for name in r.within)
+        ]
+        if references:
+            missing[path] = references
+    return missing
+
+
+def _scan_path(path, **kwargs):
+    return scan_env_references(path=path, **kwargs)
+
+
+def _scan(stream, tag, default_sep, loader, nested, path):
+    default_sep = default_sep or ''
+    pattern = compile_env_pattern(default_sep)
+    references = []
+    for event in yaml.parse(stream, Loader=loader):
+        if not isinstance(event, yaml.ScalarEvent) or '${' not in event.value:
+            continue
+        if tag is None:
+            if not (event.implicit[0] or event.tag and
+                    not event.tag.startswith('tag:yaml.org,2002:')):
+                continue
+        elif event.tag != tag:
+            continue
+
+        line = event.start_mark.line + 1
+        column = event.start_mark.column + 1
+        if nested:
+            variables = _nested_variables(
+                parse_placeholders(event.value, default_sep), default_sep
+            )
+        else:
+            variables = (
+                (name, default, ()) for _, name, default in find_env_variables(
+                    event.value, pattern, default_sep, None, False
+                )
+            )
+        references.extend(
+            EnvReference(name, default, line, column, path, within)
+            for name, default, within in variables
+        )
+    return references
+
+
+def _nested_variables(segments, default_sep, within=()):
+    for segment in segments:
+        if isinstance(segment, str):
+            continue
+        name, default = segment
+        yield name, None if default is None \
+            else _unparse(default, default_sep), within
+        if default is not None:
+            yield from _nested_variables(default, default_sep, within + (name,))
+
+
+def _unparse(segments, default_sep):
+    return ''.join(
+        segment if isinstance(segment, str) else
+        '${' + segment[0] + (
+            '' if segment[1] is None
+            else default_sep + _unparse(segment[1], default_sep)
+        ) + '}'
+        for segment in segments
+    )
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import yaml
+
+from .flat_index import FlatIndex
+from .parse_config import parse_config
+
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 1
+
+
+def build_section_index(
+        path,
+        depth=1,
+        encoding='utf-8',
+        index_path=None
+):
+    """
+    Scan a yaml file once and record the byte range of every top-level key
+    (and of the keys nested up to `depth` levels below it). The index is
+    stored as json next to the file, e.g. config.yaml.idx, and is used by
+    `load_section` to parse only the part of the file that is needed.
+
+    Only block style mapping keys that start their own line are indexed,
+    flow style mappings and sequences are left to the full parse.
+
+    :param str path: the path to the yaml file
+    :param int depth: how many levels of keys to index, 1 for top-level only
+    :param str encoding: the encoding of the file, defaults to utf-8
+    :param str index_path: where to store the index, defaults to
+    path + '.idx'. If it can not be written, the index is only returned.
+    :return: the index
+    :rtype: dict
+    """
+    with open(path, 'rb') as conf_data:
+        raw = conf_data.read()
+    text = raw.decode(encoding)
+    root = yaml.compose(text, Loader=yaml.SafeLoader)
+
+    ranges = []
+    stack = [((), root, 1)] if isinstance(root, yaml.MappingNode) else []
+    while stack:
+        parent_keys, node, level = stack.pop()
+        for key_node, value_node in node.value:
+            if not isinstance(key_node, yaml.ScalarNode) \
+                    or key_node.tag == 'tag:yaml.org,2002:merge':
+                continue
+            key_start = key_node.start_mark.index
+            line_start = text.rfind('\n', 0, key_start) + 1
+            if text[line_start:key_start].strip():
+                continue
+            keys = parent_keys + (key_node.value,)
+            ranges.append((keys, line_start, value_node.end_mark.index))
+            if level < depth and isinstance(value_node, yaml.MappingNode):
+                stack.append((keys, value_node, level + 1))
+
+    offsets = _char_to_byte_offsets(
+        text, [r[1] for r in ranges] + [r[2] for r in ranges], encoding
+    )
+    stat = os.stat(path)
+    index = {
+        'version': INDEX_VERSION,
+        'encoding': encoding,
+        'depth': depth,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hashlib.sha256(raw).hexdigest(),
+        'sections': [
+            [list(keys), offsets[start], offsets[end]]
+            for keys, start, end in sorted(ranges)
+        ],
+    }
+    _write_index(index, index_path or path + INDEX_SUFFIX)
+    return index
+
+
+def load_section(
+        path,
+        section,
+        depth=1,
+        encoding='utf-8',
+        index_path=None,
+        **kwargs
+):
+    """
+    Load a single section of a (large) yaml file, e.g.
+    load_section('config.yaml', 'tenants.acme', depth=2), by seeking to
+    the byte range recorded in the section index and parsing only that
+    part with `parse_config`. The index is built on first use and rebuilt
+    whenever the file changes (checked by size and mtime, then by hash).
+
+    If the section cannot be parsed on its own, e.g. because it uses an
+    alias whose anchor is defined elsewhere in the file, the whole file
+    is parsed instead.
+
+    :param str path: the path to the yaml file
+    :param section: the dotted path of the section, or a list of keys if
+    the keys themselves contain dots
+    :param int depth: how many levels of keys to index, see
+    `build_section_index`
+    :param str encoding: the encoding of the file, defaults to utf-8
+    :param str index_path: where the index is stored, defaults to
+    path + '.idx'
+    :param kwargs: any other keyword arguments are passed to `parse_config`,
+    flatten=True returns a FlatIndex over the section
+    :return: the resolved section
+    """
+    if kwargs.pop('flatten', False):
+        return FlatIndex(load_section(
+            path, section, depth, encoding, index_path, **kwargs
+        ))
+    keys = tuple(section.split('.')) if isinstance(section, str) \
+        else tuple(section)
+    index_path = index_path or path + INDEX_SUFFIX
+    index = _read_index(path, index_path, encoding, depth)
+    if index is None:
+        index = build_section_index(path, depth, encoding, index_path)
+
+    found = None
+    for section_keys, start, end in index['sections']:
+        section_keys = tuple(section_keys)
+        if keys[:len(section_keys)] == section_keys and \
+                (found is None or len(section_keys) > len(found[0])):
+            found = (section_keys, start, end)
+
+    if found is None:
+        return _walk(parse_config(path=path, encoding=encoding, **kwargs), keys)
+
+    section_keys, start, end = found
+    with open(path, 'rb') as conf_data:
+        conf_data.seek(start)
+        data = conf_data.read(end - start).decode(encoding)
+    try:
+        parsed = parse_config(data=data, **kwargs)
+    except yaml.composer.ComposerError:
+        return _walk(parse_config(path=path, encoding=encoding, **kwargs), keys)
+    return _walk(next(iter(parsed.values())), keys[len(section_keys):])
+
+
+def _walk(config, keys):
+    for key in keys:
+        config = config[key]
+    return config
+
+
+def _char_to_byte_offsets(text, offsets, encoding):
+    """
+    Map character offsets in the decoded text to byte offsets in the file,
+    in one pass over the text.
+    """
+    result = {}
+    prev_char = prev_byte = 0
+    for offset in sorted(set(offsets)):
+        prev_byte += len(text[prev_char:offset].encode(encoding))
+        prev_char = offset
+        result[offset] = prev_byte
+    return result
+
+
+def _read_index(path, index_path, encoding, depth):
+    try:
+        with open(index_path, encoding='utf-8') as index_data:
+            index = json.load(index_data)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != INDEX_VERSION or \
+            index.get('encoding') != encoding or \
+            index.get('depth', 0) < depth:
+        return None
+
+    stat = os.stat(path)
+    if index['size'] != stat.st_size:
+        return None
+    if index['mtime_ns'] == stat.st_mtime_ns:
+        return index
+    # the file was touched, check whether the contents actually changed
+    with open(path, 'rb') as conf_data:
+        sha256 = hashlib.sha256(conf_data.read()).hexdigest()
+    if sha256 != index['sha256']:
+        return None
+    index['mtime_ns'] = stat.st_mtime_ns
+    _write_index(index, index_path)
+    return index
+
+
+def _write_index(index, index_path):
+    # the index is only a cache: if it can not be stored, e.g. next to a
+    # file in a read-only directory, it is used from memory
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(index_path)), suffix='.tmp'
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as index_data:
+            json.dump(index, index_data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        os.remove(tmp_path)
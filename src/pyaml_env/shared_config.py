@@ -0,0 +1,312 @@
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from collections.abc import Mapping, Sequence
+
+MAGIC = b'PYAMLENV\x01'
+HEADER = struct.Struct('<Q')
+COUNT = struct.Struct('<Q')
+INT = struct.Struct('<q')
+FLOAT = struct.Struct('<d')
+ENTRY = struct.Struct('<QQQ')
+OFFSET = struct.Struct('<Q')
+
+
+def dump_shared(config, path):
+    """
+    Write a parsed configuration to a compact binary file, that
+    load_shared maps into memory read-only. Meant for a master process that
+    parses the configuration once, so that forked workers share the same
+    pages (e.g. a file in /dev/shm) instead of every worker keeping its own
+    copy of the python objects.
+
+    Mappings and sequences are kept as such, None, bool, int, float, str and
+    bytes are stored natively, any other value (e.g. dates) is pickled. Only
+    load files written by a trusted process.
+
+    The file is written next to the path and then renamed over it, so that
+    the workers that still have the previous file loaded keep reading it.
+
+    :param config: the configuration, as returned by parse_config
+    :param str path: where to write the file
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as shared_file:
+            shared_file.write(MAGIC + HEADER.pack(0))
+            root = _Writer(shared_file).write(config)
+            shared_file.seek(len(MAGIC))
+            shared_file.write(HEADER.pack(root))
+        # mkstemp creates the file readable by the owner only
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777
+                 if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_shared(path):
+    """
+    Map a file written by dump_shared into memory. Nothing is decoded up
+    front, values are decoded when they are accessed.
+    :param str path: the path of the file
+    :return: the configuration as read-only views, a SharedMapping for every
+    mapping and a SharedSequence for every sequence
+    """
+    with open(path, 'rb') as shared_file:
+        buf = mmap.mmap(shared_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if buf[:len(MAGIC)] != MAGIC:
+        buf.close()
+        raise ValueError(f'{path} was not written by dump_shared')
+    return _decode(buf, HEADER.unpack_from(buf, len(MAGIC))[0])
+
+
+class SharedMapping(Mapping):
+    """
+    A read-only mapping over a dump_shared buffer. Keys are looked up with a
+    binary search and the values decoded on access. Keys can also be
+    accessed as attributes, like with BaseConfig.
+    """
+    __slots__ = ('_buf', '_offset', '_count')
+
+    def __init__(self, buf, offset):
+        self._buf = buf
+        self._offset = offset
+        self._count = COUNT.unpack_from(buf, offset + 1)[0]
+
+    def __getitem__(self, key):
+        encoded = _encode_scalar(key)
+        entries = self._offset + 1 + COUNT.size
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_offset, key_length, value_offset = ENTRY.unpack_from(
+                self._buf, entries + mid * ENTRY.size
+            )
+            stored = self._buf[key_offset:key_offset + key_length]
+            if stored == encoded:
+                return _decode(self._buf, value_offset)
+            if stored < encoded:
+                lo = mid + 1
+            else:
+                hi = mid
+        raise KeyError(key)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self):
+        entries = self._offset + 1 + COUNT.size
+        order = entries + self._count * ENTRY.size
+        for i in range(self._count):
+            index = OFFSET.unpack_from(self._buf, order + i * OFFSET.size)[0]
+            key_offset = ENTRY.unpack_from(
+                self._buf, entries + index * ENTRY.size
+            )[0]
+            yield _decode(self._buf, key_offset)
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self)} keys)'
+
+    def to_dict(self):
+        """
+        :return: a copy of the configuration as plain dicts and lists
+        :rtype: dict
+        """
+        return _materialize(self)
+
+
+class SharedSequence(Sequence):
+    """
+    A read-only sequence over a dump_shared buffer, items are decoded on
+    access.
+    """
+    __slots__ = ('_buf', '_offset', '_count')
+
+    def __init__(self, buf, offset):
+        self._buf = buf
+        self._offset = offset
+        self._count = COUNT.unpack_from(buf, offset + 1)[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('index out of range')
+        return _decode(self._buf, OFFSET.unpack_from(
+            self._buf, self._offset + 1 + COUNT.size + index * OFFSET.size
+        )[0])
+
+    def __len__(self):
+        return self._count
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, SharedSequence)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self)} items)'
+
+    def to_list(self):
+        """
+        :return: a copy of the sequence as plain dicts and lists
+        :rtype: list
+        """
+        return _materialize(self)
+
+
+class _Writer:
+    """
+    Writes the nodes children first, so that every container can point to
+    its children, without recursion.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.offset = stream.tell()
+
+    def emit(self, data):
+        offset = self.offset
+        self.stream.write(data)
+        self.offset += len(data)
+        return offset
+
+    def write(self, root):
+        written = {}
+        in_progress = set()
+        offsets = []
+        stack = [(root, False)]
+        while stack:
+            node, children_written = stack.pop()
+            if not isinstance(node, (Mapping, list, tuple)):
+                offsets.append(self.emit(_encode_scalar(node)))
+                continue
+            if id(node) in written:
+                offsets.append(written[id(node)])
+                continue
+            if not children_written:
+                if id(node) in in_progress:
+                    raise ValueError('Recursive structures can not be shared')
+                in_progress.add(id(node))
+                stack.append((node, True))
+                children = node.values() if isinstance(node, Mapping) else node
+                stack.extend((child, False) for child in reversed(list(children)))
+                continue
+
+            children = offsets[len(offsets) - len(node):]
+            del offsets[len(offsets) - len(node):]
+            if isinstance(node, Mapping):
+                entries = []
+                for i, (key, value_offset) in enumerate(zip(node, children)):
+                    encoded = _encode_scalar(key)
+                    entries.append(
+                        (encoded, self.emit(encoded), value_offset, i)
+                    )
+                entries.sort()
+                order = [0] * len(entries)
+                for index, entry in enumerate(entries):
+                    order[entry[3]] = index
+                offset = self.emit(b''.join(
+                    [b'd', COUNT.pack(len(entries))] +
+                    [ENTRY.pack(key_offset, len(encoded), value_offset)
+                     for encoded, key_offset, value_offset, _ in entries] +
+                    [OFFSET.pack(index) for index in order]
+                ))
+            else:
+                offset = self.emit(b''.join(
+                    [b'l', COUNT.pack(len(children))] +
+                    [OFFSET.pack(child) for child in children]
+                ))
+            in_progress.discard(id(node))
+            written[id(node)] = offset
+            offsets.append(offset)
+        return offsets[0]
+
+
+def _encode_scalar(value):
+    if value is None:
+        return b'N'
+    if value is True:
+        return b'T'
+    if value is False:
+        return b'F'
+    if type(value) is int:
+        if -2 ** 63 <= value < 2 ** 63:
+            return b'i' + INT.pack(value)
+        data = str(value).encode()
+        return b'I' + COUNT.pack(len(data)) + data
+    if type(value) is float:
+        return b'f' + FLOAT.pack(value)
+    if type(value) is str:
+        data = value.encode('utf-8')
+        return b's' + COUNT.pack(len(data)) + data
+    if type(value) is bytes:
+        return b'b' + COUNT.pack(len(value)) + value
+    data = pickle.dumps(value)
+    return b'p' + COUNT.pack(len(data)) + data
+
+
+def _decode(buf, offset):
+    kind = buf[offset:offset + 1]
+    if kind == b'd':
+        return SharedMapping(buf, offset)
+    if kind == b'l':
+        return SharedSequence(buf, offset)
+    if kind == b's':
+        length = COUNT.unpack_from(buf, offset + 1)[0]
+        start = offset + 1 + COUNT.size
+        return buf[start:start + length].decode('utf-8')
+    if kind == b'i':
+        return INT.unpack_from(buf, offset + 1)[0]
+    if kind == b'f':
+        return FLOAT.unpack_from(buf, offset + 1)[0]
+    if kind == b'N':
+        return None
+    if kind == b'T':
+        return True
+    if kind == b'F':
+        return False
+    length = COUNT.unpack_from(buf, offset + 1)[0]
+    start = offset + 1 + COUNT.size
+    data = buf[start:start + length]
+    if kind == b'I':
+        return int(data)
+    if kind == b'b':
+        return data
+    return pickle.loads(data)
+
+
+def _materialize(root):
+    result = {} if isinstance(root, Mapping) else []
+    stack = [(root, result)]
+    while stack:
+        view, copy = stack.pop()
+        items = view.items() if isinstance(view, Mapping) else enumerate(view)
+        for key, value in items:
+            if isinstance(value, (SharedMapping, SharedSequence)):
+                value_copy = {} if isinstance(value, Mapping) else []
+                stack.append((value, value_copy))
+                value = value_copy
+            if isinstance(copy, dict):
+                copy[key] = value
+            else:
+                copy.append(value)
+    return result
@@ -1,6 +1,6 @@
 import os
 import unittest
-from pyaml_env import BaseConfig
+from pyaml_env import BaseConfig, parse_config
 
 
 class TestBaseConfig(unittest.TestCase):
@@ -70,4 +70,107 @@ class TestBaseConfig(unittest.TestCase):
         self.assertIsInstance(base_config.a.b.c, list)
         self.assertIsInstance(base_config.a.b.d, BaseConfig)
         self.assertIsInstance(base_config.a.b.d.e, int)
-        self.assertIsInstance(base_config.a.b.d.f, str)
\ No newline at end of file
+        self.assertIsInstance(base_config.a.b.d.f, str)
+
+    def test_base_config_lookup(self):
+        base_config = BaseConfig(self.complex_data, flat_index=True)
+
+        self.assertEqual(base_config.lookup('a.b.d.e'), 12)
+        self.assertEqual(base_config.lookup('g.k'), [1, 3, 5])
+        self.assertIsInstance(base_config.lookup('a.b'), BaseConfig)
+        self.assertEqual(
+            BaseConfig(self.complex_data).lookup('a.b.d.f'), 'test'
+        )
+
+    def test_base_config_lists_of_mappings(self):
+        data = {'a': [{'b': 1}, [{'c': 2}], 3]}
+        base_config = BaseConfig(data)
+
+        self.assertIsInstance(base_config.a[0], BaseConfig)
+        self.assertEqual(base_config.a[0].b, 1)
+        self.assertIsInstance(base_config.a[1][0], BaseConfig)
+        self.assertEqual(base_config.a[1][0].c, 2)
+        self.assertEqual(base_config.a[2], 3)
+        # the given configuration is not modified
+        self.assertEqual(data, {'a': [{'b': 1}, [{'c': 2}], 3]})
+
+    def test_base_config_deep_structure(self):
+        depth = 5000
+        data = {}
+        inner = data
+        for _ in range(depth):
+            inner['a'] = {}
+            inner = inner['a']
+        inner['b'] = 1
+
+        base_config = BaseConfig(data)
+        value = base_config
+        for _ in range(depth):
+            value = value.a
+        self.assertEqual(value.b, 1)
+
+        result = base_config.to_dict()
+        for _ in range(depth):
+            result = result['a']
+        self.assertEqual(result, {'b': 1})
+
+    def test_base_config_to_dict(self):
+        data = dict(self.complex_data, l=[{'m': {'n': 1}}, [2]])
+        base_config = BaseConfig.from_dict(data, flat_index=True)
+
+        self.assertIsInstance(base_config, BaseConfig)
+        self.assertEqual(base_config.to_dict(), data)
+        self.assertEqual(BaseConfig(self.simple_data).to_dict(), self.simple_data)
+        self.assertEqual(BaseConfig({}).to_dict(), {})
+
+    def test_base_config_recursive_structure(self):
+        config = parse_config(data='a: &a {b: *a}\nl: &l [1, *l]\n')
+        with self.assertRaises(ValueError):
+            BaseConfig(config)
+        with self.assertRaises(ValueError):
+            BaseConfig({'l': config['l']})
+
+        base_config = BaseConfig({'c': 1})
+        base_config.d = base_config
+        with self.assertRaises(ValueError):
+            base_config.to_dict()
+
+    def test_base_config_shared_structure(self):
+        config = parse_config(data='a: &a {b: 1}\nc: *a\nd: [*a, *a]\n')
+        base_config = BaseConfig(config)
+
+        self.assertEqual(base_config.c.b, 1)
+        self.assertEqual(base_config.d[1].b, 1)
+        self.assertEqual(base_config.to_dict(), config)
+
+    def test_base_config_lookup_same_objects(self):
+        data = {'items': [{'x': 1}], 'a': {'b': {}, 'c': [{'d': 2}]}}
+        indexed = BaseConfig(data, flat_index=True)
+        plain = BaseConfig(data)
+
+        for path in ('items', 'a', 'a.b', 'a.c'):
+            self.assertEqual(
+                type(indexed.lookup(path)), type(plain.lookup(path))
+            )
+        self.assertIsInstance(indexed.lookup('items')[0], BaseConfig)
+        self.assertIs(indexed.lookup('items'), indexed.items)
+        self.assertIs(indexed.lookup('a.b'), indexed.a.b)
+        self.assertEqual(indexed.lookup('a.c')[0].d, 2)
+
+    def test_base_config_lookup_after_change(self):
+        data = {'a': {'b': 1, 'c': {'d': 2}}, 'e': 3}
+        indexed = BaseConfig(data, flat_index=True)
+        self.assertEqual(indexed.lookup('a.b'), 1)
+
+        indexed.a.b = 5
+        indexed.a.c.f = 6
+        indexed.e = 7
+        del indexed.a.c.d
+        plain = BaseConfig(data)
+        plain.a.b = 5
+
+        self.assertEqual(indexed.lookup('a.b'), plain.lookup('a.b'))
+        self.assertEqual(indexed.lookup('a.c.f'), 6)
+        self.assertEqual(indexed.lookup('e'), 7)
+        self.assertNotIn('a.c.d', indexed._flat_index)
+        self.assertEqual(indexed.to_dict(), {'a': {'b': 5, 'c': {'f': 6}}, 'e': 7})
@@ -0,0 +1,161 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+from pyaml_env.cli import Renderer, main, serve
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.env_var1 = 'ENV_TAG1'
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'config.yaml')
+        self.write('''
+        database:
+            url: !ENV http://${ENV_TAG1:localhost}:5432
+            port: !ENV tag:yaml.org,2002:int ${ENV_TAG2:5432}
+        ''')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        if self.env_var1 in os.environ:
+            del os.environ[self.env_var1]
+
+    def write(self, data):
+        with open(self.path, 'w') as conf_file:
+            conf_file.write(data)
+
+    def run_main(self, argv, stdin=''):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), \
+                mock.patch('sys.stdin', io.StringIO(stdin)):
+            status = main(argv)
+        return status, stdout.getvalue()
+
+    def test_main_json(self):
+        os.environ[self.env_var1] = 'db.acme'
+        status, output = self.run_main([self.path])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(output), {
+            'database': {'url': 'http://db.acme:5432', 'port': 5432}
+        })
+
+    def test_main_yaml_many_paths(self):
+        status, output = self.run_main(['-f', 'yaml', self.path, self.path])
+
+        self.assertEqual(status, 0)
+        document = 'database:\n  url: http://localhost:5432\n  port: 5432\n'
+        self.assertEqual(output, document + '---\n' + document)
+
+    def test_main_stdin(self):
+        status, output = self.run_main(
+            ['--untagged', '-'], stdin='url: http://${ENV_TAG1:localhost}\n'
+        )
+
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(output), {'url': 'http://localhost'})
+
+    def test_main_missing_file(self):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            status, _ = self.run_main([self.path + '.missing'])
+
+        self.assertEqual(status, 1)
+        self.assertIn('config.yaml.missing', stderr.getvalue())
+
+    def test_main_non_string_keys(self):
+        self.write('2021-01-02: k\nnested:\n  2021-01-03: !ENV ${ENV_TAG1:v}\n'
+                   '1: x\n')
+        status, output = self.run_main([self.path])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(output), {
+            '2021-01-02': 'k', 'nested': {'2021-01-03': 'v'}, '1': 'x'
+        })
+
+    def test_main_format_error(self):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr), mock.patch(
+                'pyaml_env.cli.format_config', side_effect=TypeError('bad')
+        ):
+            status, output = self.run_main([self.path])
+
+        self.assertEqual(status, 1)
+        self.assertEqual(output, '')
+        self.assertEqual(stderr.getvalue(), f'pyaml-env: {self.path}: bad\n')
+
+    def test_batch(self):
+        requests = '\n'.join([
+            self.path,
+            json.dumps({
+                'id': 2,
+                'path': self.path,
+                'env': {self.env_var1: 'db.acme'},
+                'format': 'yaml',
+            }),
+            json.dumps({'id': 3, 'data': 'a: !ENV ${ENV_TAG1:1}'}),
+            '',
+            json.dumps({'id': 4, 'path': self.path, 'unknown': True}),
+            self.path + '.missing',
+        ])
+        status, output = self.run_main(['--batch'], stdin=requests)
+        responses = [json.loads(line) for line in output.splitlines()]
+
+        self.assertEqual(status, 0)
+        self.assertEqual(responses[0], {'path': self.path, 'config': {
+            'database': {'url': 'http://localhost:5432', 'port': 5432}
+        }})
+        self.assertEqual(responses[1], {
+            'id': 2,
+            'path': self.path,
+            'config': 'database:\n  url: http://db.acme:5432\n  port: 5432\n'
+        })
+        self.assertEqual(responses[2], {'id': 3, 'config': {'a': '1'}})
+        self.assertEqual(responses[3], {
+            'id': 4,
+            'path': self.path,
+            'error': 'ValueError: Unknown options unknown'
+        })
+        self.assertEqual(len(responses), 5)
+        self.assertTrue(responses[4]['error'].startswith('FileNotFoundError'))
+
+    def test_renderer_cache(self):
+        renderer = Renderer()
+        first = renderer.render(self.path)
+        with mock.patch('pyaml_env.cli.ConfigTemplate') as template:
+            os.environ[self.env_var1] = 'db.acme'
+            self.assertEqual(
+                renderer.render(self.path),
+                {'database': {'url': 'http://db.acme:5432', 'port': 5432}}
+            )
+            template.assert_not_called()
+        self.assertEqual(first['database']['url'], 'http://localhost:5432')
+
+        self.write('database: !ENV ${ENV_TAG1}\n')
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(renderer.render(self.path), {'database': 'db.acme'})
+
+    def test_renderer_maxsize(self):
+        renderer = Renderer(maxsize=1)
+        renderer.render(self.path)
+        renderer.render(self.path, default_value='')
+
+        self.assertEqual(len(renderer._templates), 1)
+        renderer.clear()
+        self.assertEqual(len(renderer._templates), 0)
+
+    def test_serve_flushes_every_answer(self):
+        responses = mock.Mock()
+        serve(Renderer(), [self.path, self.path], responses)
+
+        self.assertEqual(responses.flush.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
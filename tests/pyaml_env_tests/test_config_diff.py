@@ -0,0 +1,124 @@
+import os
+import unittest
+
+from pyaml_env import (
+    parse_config,
+    dump_config,
+    diff_config,
+    hash_config,
+    HashedDict,
+    HashedList,
+)
+
+
+class TestConfigDiff(unittest.TestCase):
+    def setUp(self):
+        self.env_var1 = 'ENV_TAG1'
+        self.data = '''
+        database:
+            url: !ENV http://${ENV_TAG1:localhost}:5432
+            pool: 5
+        tenants:
+            - acme
+            - globex
+        cache:
+            ttl: 60
+        '''
+
+    def tearDown(self):
+        if self.env_var1 in os.environ:
+            del os.environ[self.env_var1]
+
+    def test_content_hashes(self):
+        config = parse_config(data=self.data, content_hashes=True)
+
+        self.assertIsInstance(config, HashedDict)
+        self.assertIsInstance(config['database'], HashedDict)
+        self.assertIsInstance(config['tenants'], HashedList)
+        self.assertEqual(config['database']['url'], 'http://localhost:5432')
+        self.assertEqual(len(config.content_hash), 16)
+
+    def test_content_hashes_same_config(self):
+        old = parse_config(data=self.data, content_hashes=True)
+        new = parse_config(data=self.data, content_hashes=True)
+
+        self.assertEqual(old.content_hash, new.content_hash)
+        self.assertEqual(diff_config(old, new), [])
+
+    def test_content_hashes_key_order(self):
+        old = hash_config({'a': 1, 'b': {'c': [1, 2]}})
+        new = hash_config({'b': {'c': [1, 2]}, 'a': 1})
+
+        self.assertEqual(old.content_hash, new.content_hash)
+        self.assertNotEqual(
+            old.content_hash, hash_config({'a': 1, 'b': {'c': [2, 1]}})
+            .content_hash
+        )
+
+    def test_content_hashes_value_types(self):
+        self.assertNotEqual(
+            hash_config({'a': 1}).content_hash,
+            hash_config({'a': '1'}).content_hash
+        )
+        self.assertNotEqual(
+            hash_config({'a': 1}).content_hash,
+            hash_config({'a': True}).content_hash
+        )
+
+    def test_diff_config(self):
+        old = parse_config(data=self.data, content_hashes=True)
+        os.environ[self.env_var1] = 'db.acme'
+        new = parse_config(
+            data=self.data.replace('globex', 'initech'), content_hashes=True
+        )
+
+        self.assertEqual(old['cache'].content_hash, new['cache'].content_hash)
+        self.assertEqual(diff_config(old, new), [
+            ('database', 'url'),
+            ('tenants', 1),
+        ])
+
+    def test_diff_config_added_and_removed_keys(self):
+        old = hash_config({'a': {'b': 1, 'c': 2}, 'd': [1, 2]})
+        new = hash_config({'a': {'b': 1, 'e': 3}, 'd': [1, 2, 3]})
+
+        self.assertEqual(diff_config(old, new), [
+            ('a', 'e'),
+            ('a', 'c'),
+            ('d',),
+        ])
+
+    def test_diff_config_without_hashes(self):
+        self.assertEqual(
+            diff_config({'a': {'b': 1}, 'c': 2}, {'a': {'b': 2}, 'c': 2}),
+            [('a', 'b')]
+        )
+        self.assertEqual(diff_config({'a': 1}, [1]), [()])
+
+    def test_hash_config_aliases(self):
+        config = parse_config(data='''
+        base: &base
+            pool: 5
+        db: *base
+        ''', content_hashes=True)
+
+        self.assertIs(config['base'], config['db'])
+        self.assertEqual(config['base'].content_hash, config['db'].content_hash)
+
+    def test_hash_config_recursive(self):
+        config = {}
+        config['a'] = config
+        with self.assertRaises(ValueError):
+            hash_config(config)
+
+    def test_dump_config_hashed(self):
+        config = parse_config(data=self.data, content_hashes=True)
+
+        self.assertEqual(
+            dump_config(config),
+            dump_config(parse_config(data=self.data))
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
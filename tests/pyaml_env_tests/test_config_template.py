@@ -0,0 +1,120 @@
+import os
+import unittest
+
+from pyaml_env import parse_config, ConfigTemplate
+
+
+class TestConfigTemplate(unittest.TestCase):
+    def setUp(self):
+        self.test_data = '''
+        test1:
+            data0: !ENV ${TENANT}
+            data1: !ENV http://${DB_HOST:localhost}:${DB_PORT:5432}
+            data2: !ENV tag:yaml.org,2002:int ${DB_PORT:5432}
+            data3: [1, !ENV '${TENANT}-replica']
+        test2:
+            data0: static
+            data1: [1, 2]
+        '''
+        self.environs = [
+            {'TENANT': 'acme', 'DB_HOST': 'acme.db'},
+            {'TENANT': 'globex', 'DB_PORT': '6543'},
+        ]
+
+    def test_config_template_render(self):
+        template = ConfigTemplate(data=self.test_data)
+
+        config = template.render(self.environs[0])
+        self.assertDictEqual(config, {
+            'test1': {
+                'data0': 'acme',
+                'data1': 'http://acme.db:5432',
+                'data2': 5432,
+                'data3': [1, 'acme-replica'],
+            },
+            'test2': {'data0': 'static', 'data1': [1, 2]},
+        })
+        # the template itself is left untouched and unchanged parts shared
+        other = template.render(self.environs[1])
+        self.assertEqual(other['test1']['data2'], 6543)
+        self.assertEqual(config['test1']['data0'], 'acme')
+        self.assertIs(config['test2'], other['test2'])
+
+    def test_config_template_render_like_parse_config(self):
+        template = ConfigTemplate(data=self.test_data, tag='!ENV', default_value='++')
+
+        config = template.render({})
+        self.assertDictEqual(
+            config, parse_config(data=self.test_data, default_value='++')
+        )
+
+    def test_config_template_render_many(self):
+        template = ConfigTemplate(data=self.test_data)
+
+        expected = [template.render(environ) for environ in self.environs]
+        self.assertEqual(list(template.render_many(self.environs)), expected)
+        self.assertEqual(
+            list(template.render_many(self.environs, processes=2)), expected
+        )
+
+    def test_config_template_scalar_document(self):
+        template = ConfigTemplate(data='!ENV ${TENANT:none}')
+
+        self.assertEqual(template.render({'TENANT': 'acme'}), 'acme')
+        self.assertEqual(template.render({}), 'none')
+
+    def test_config_template_nested(self):
+        template = ConfigTemplate(
+            data='url: !ENV ${URL:http://${DB_HOST:localhost}:${DB_PORT:5432}}',
+            nested=True
+        )
+
+        self.assertEqual(
+            template.render({'DB_HOST': 'acme.db'}),
+            {'url': 'http://acme.db:5432'}
+        )
+        self.assertEqual(
+            template.render({'URL': '${DB_HOST}', 'DB_HOST': 'globex.db'}),
+            {'url': 'globex.db'}
+        )
+
+    def test_config_template_recursive(self):
+        with self.assertRaises(ValueError):
+            ConfigTemplate(data='a: &a\n  b: *a\n  c: !ENV ${X:1}\n')
+
+    def test_config_template_aliases(self):
+        template = ConfigTemplate(data='a: &a {b: !ENV "${X:1}"}\nc: *a\n')
+
+        self.assertEqual(
+            template.render({'X': '2'}), {'a': {'b': '2'}, 'c': {'b': '2'}}
+        )
+
+    def test_config_template_tagged_keys(self):
+        test_data = '''
+        !ENV ${KEY1:root}:
+            !ENV ${KEY2:inner}: !ENV ${VALUE:1}
+            !ENV tag:yaml.org,2002:int ${KEY3:3}:
+                - a
+                - !ENV ${KEY2:x}: b
+            plain: c
+        other: !ENV ${VALUE:2}
+        '''
+        template = ConfigTemplate(data=test_data)
+
+        for environ in ({}, {'KEY1': 'k1', 'KEY2': 'k2', 'KEY3': '4',
+                             'VALUE': 'v'}):
+            os.environ.update(environ)
+            try:
+                expected = parse_config(data=test_data)
+            finally:
+                for name in environ:
+                    del os.environ[name]
+            self.assertEqual(template.render(environ), expected)
+            self.assertEqual(
+                list(template.render_many([environ], processes=1)),
+                [expected]
+            )
+        self.assertEqual(template.render({}), {
+            'root': {'inner': '1', 3: ['a', {'x': 'b'}], 'plain': 'c'},
+            'other': '2',
+        })
@@ -0,0 +1,101 @@
+import io
+import os
+import unittest
+
+import yaml
+
+from pyaml_env import parse_config, dump_config, EnvTemplate
+
+
+class TestDumpConfig(unittest.TestCase):
+    def setUp(self):
+        self.env_var1 = 'ENV_TAG1'
+        self.env_var2 = 'ENV_TAG2'
+        self.test_data = '''test1:
+  data0: !ENV ${ENV_TAG1}
+  data1: !ENV http://${ENV_TAG2:localhost}:${ENV_TAG1:5432}
+  data2: !ENV tag:yaml.org,2002:int ${ENV_TAG1:5432}
+  data3: plain
+  data4:
+  - 1
+  - 2
+'''
+
+    def tearDown(self):
+        if self.env_var1 in os.environ:
+            del os.environ[self.env_var1]
+        if self.env_var2 in os.environ:
+            del os.environ[self.env_var2]
+
+    def test_parse_config_round_trip(self):
+        os.environ[self.env_var1] = '1024'
+        config = parse_config(data=self.test_data, round_trip=True)
+
+        data0 = config['test1']['data0']
+        self.assertIsInstance(data0, EnvTemplate)
+        self.assertEqual(data0.tag, '!ENV')
+        self.assertEqual(data0.template, '${ENV_TAG1}')
+        self.assertEqual(data0.value, '1024')
+        self.assertEqual(config['test1']['data1'].value, 'http://localhost:1024')
+        self.assertEqual(config['test1']['data2'].value, 1024)
+        self.assertEqual(config['test1']['data3'], 'plain')
+
+    def test_dump_config_keeps_placeholders(self):
+        os.environ[self.env_var1] = '1024'
+        config = parse_config(data=self.test_data, round_trip=True)
+
+        # tagged scalars are quoted, which does not change their value
+        self.assertEqual(
+            dump_config(config),
+            self.test_data
+                .replace('!ENV ${ENV_TAG1}', "!ENV '${ENV_TAG1}'")
+                .replace('!ENV http://${ENV_TAG2:localhost}:${ENV_TAG1:5432}',
+                         "!ENV 'http://${ENV_TAG2:localhost}:${ENV_TAG1:5432}'")
+                .replace('!ENV tag:yaml.org,2002:int ${ENV_TAG1:5432}',
+                         "!ENV 'tag:yaml.org,2002:int ${ENV_TAG1:5432}'")
+        )
+
+    def test_dump_config_stream(self):
+        config = parse_config(data=self.test_data, round_trip=True)
+        config['test1']['data3'] = 'edited'
+        config['test2'] = {'data0': 1}
+
+        stream = io.StringIO()
+        self.assertIsNone(dump_config(config, stream))
+        reloaded = parse_config(data=stream.getvalue())
+
+        self.assertDictEqual(reloaded, {
+            'test1': {
+                'data0': 'N/A',
+                'data1': 'http://localhost:5432',
+                'data2': 5432,
+                'data3': 'edited',
+                'data4': [1, 2],
+            },
+            'test2': {'data0': 1},
+        })
+
+    def test_dump_config_no_tag(self):
+        test_data = 'test1:\n  data0: ${ENV_TAG1:default}\n'
+        # use a subclass, tag=None registers the constructor for all tags
+        loader = type('NoTagLoader', (yaml.SafeLoader,), {})
+        config = parse_config(
+            data=test_data, tag=None, round_trip=True, loader=loader
+        )
+
+        self.assertEqual(config['test1']['data0'].value, 'default')
+        self.assertEqual(dump_config(config), test_data)
+
+    def test_dump_config_same_placeholders(self):
+        test_data = "a: !ENV '${ENV_TAG1:1}'\nb: !ENV '${ENV_TAG1:1}'\n"
+        config = parse_config(data=test_data, round_trip=True)
+
+        self.assertIsNot(config['a'], config['b'])
+        self.assertEqual(dump_config(config), test_data)
+
+        config['a'].template = '${ENV_TAG2:2}'
+        self.assertEqual(config['b'].template, '${ENV_TAG1:1}')
+        self.assertEqual(
+            dump_config(config),
+            "a: !ENV '${ENV_TAG2:2}'\nb: !ENV '${ENV_TAG1:1}'\n"
+        )
@@ -0,0 +1,93 @@
+import os
+import unittest
+
+from pyaml_env import parse_config, FlatIndex
+
+
+class TestFlatIndex(unittest.TestCase):
+    def setUp(self):
+        self.env_var1 = 'ENV_TAG1'
+        self.complex_data = {
+            'a': {
+                'b': {
+                    'c': [1, 2],
+                    'd': {
+                        'e': 12,
+                        'f': 'test'
+                    }
+                },
+                'bb': True
+            },
+            'g': {
+                'h-i': None,
+                'j': {}
+            }
+        }
+
+    def tearDown(self):
+        if self.env_var1 in os.environ:
+            del os.environ[self.env_var1]
+
+    def test_flat_index(self):
+        index = FlatIndex(self.complex_data)
+
+        self.assertDictEqual(dict(index), {
+            'a.b.c': [1, 2],
+            'a.b.d.e': 12,
+            'a.b.d.f': 'test',
+            'a.bb': True,
+            'g.h-i': None,
+            'g.j': {},
+        })
+        self.assertEqual(list(index), sorted(index))
+        self.assertEqual(index['a.b.d.e'], 12)
+        self.assertNotIn('a.b', index)
+
+    def test_flat_index_with_prefix(self):
+        index = FlatIndex(self.complex_data)
+
+        self.assertDictEqual(index.with_prefix('a.b'), {
+            'a.b.c': [1, 2],
+            'a.b.d.e': 12,
+            'a.b.d.f': 'test',
+        })
+        self.assertDictEqual(index.with_prefix('a.bb'), {'a.bb': True})
+        self.assertDictEqual(index.with_prefix('x'), {})
+
+    def test_flat_index_to_env(self):
+        index = FlatIndex(self.complex_data)
+
+        self.assertDictEqual(index.to_env(prefix='APP__'), {
+            'APP__A__B__C': '[1, 2]',
+            'APP__A__B__D__E': '12',
+            'APP__A__B__D__F': 'test',
+            'APP__A__BB': 'true',
+            'APP__G__H_I': 'null',
+            'APP__G__J': '{}',
+        })
+
+    def test_parse_config_flatten(self):
+        os.environ[self.env_var1] = 'it works!'
+        test_data = '''
+        test1:
+            data0: !ENV ${ENV_TAG1}
+            data1:
+                data2: 1
+        '''
+        index = parse_config(data=test_data, flatten=True)
+
+        self.assertIsInstance(index, FlatIndex)
+        self.assertEqual(index['test1.data0'], 'it works!')
+        self.assertEqual(index['test1.data1.data2'], 1)
+
+    def test_flat_index_not_a_mapping(self):
+        with self.assertRaises(ValueError):
+            parse_config(data='- a\n- b\n', flatten=True)
+        self.assertEqual(len(FlatIndex(None)), 0)
+
+    def test_flat_index_recursive(self):
+        with self.assertRaises(ValueError):
+            parse_config(data='a: &a {b: *a}\n', flatten=True)
+
+        index = parse_config(data='a: &a {b: 1}\nc: *a\n', flatten=True)
+        self.assertEqual(dict(index), {'a.b': 1, 'c.b': 1})
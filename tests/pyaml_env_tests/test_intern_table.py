@@ -0,0 +1,86 @@
+import os
+import unittest
+
+from pyaml_env import parse_config, InternTable
+
+
+class TestInternTable(unittest.TestCase):
+    def setUp(self):
+        self.env_var1 = 'ENV_TAG1'
+        self.data = '''
+        database:
+            host: !ENV ${ENV_TAG1:db.internal}
+            region: eu-west-1
+            port: 5432
+        '''
+
+    def tearDown(self):
+        if self.env_var1 in os.environ:
+            del os.environ[self.env_var1]
+
+    def test_intern(self):
+        table = InternTable()
+        value = ''.join(['eu-', 'west-1'])
+
+        self.assertIs(table.intern(value), value)
+        self.assertIs(table.intern(''.join(['eu-', 'west-1'])), value)
+        self.assertEqual(table.intern(5432), 5432)
+        self.assertEqual(len(table), 1)
+        self.assertIn('eu-west-1', table)
+
+    def test_intern_bounds(self):
+        table = InternTable(maxsize=1, max_length=4)
+        long_value = ''.join(['abc', 'de'])
+        self.assertIs(table.intern(long_value), long_value)
+        self.assertEqual(len(table), 0)
+
+        table.intern('a')
+        value = ''.join(['b', 'c'])
+        self.assertIs(table.intern(value), value)
+        self.assertEqual(len(table), 1)
+
+        table.clear()
+        self.assertEqual(len(table), 0)
+        self.assertIs(table.intern(value), value)
+
+    def test_parse_config_intern_table(self):
+        table = InternTable()
+        first = parse_config(data=self.data, intern_table=table)
+        second = parse_config(data=self.data, intern_table=table)
+
+        self.assertEqual(first, {'database': {
+            'host': 'db.internal', 'region': 'eu-west-1', 'port': 5432
+        }})
+        self.assertEqual(first, second)
+        self.assertIs(
+            first['database']['region'], second['database']['region']
+        )
+        self.assertIs(first['database']['host'], second['database']['host'])
+        self.assertIs(
+            next(iter(first['database'])), next(iter(second['database']))
+        )
+
+    def test_parse_config_intern_table_untagged(self):
+        os.environ[self.env_var1] = 'db.acme'
+        table = InternTable()
+        first = parse_config(
+            data='host: ${ENV_TAG1}\n', tag=None, intern_table=table
+        )
+        second = parse_config(
+            data='host: ${ENV_TAG1}\n', tag=None, intern_table=table
+        )
+
+        self.assertEqual(first, {'host': 'db.acme'})
+        self.assertIs(first['host'], second['host'])
+
+    def test_parse_config_without_intern_table(self):
+        first = parse_config(data=self.data)
+        second = parse_config(data=self.data)
+
+        self.assertIsNot(
+            first['database']['region'], second['database']['region']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import pyaml_env
+
+
+class TestLazyImports(unittest.TestCase):
+    def run_python(self, code):
+        return subprocess.run(
+            [sys.executable, '-c', code],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+        ).stdout.split()
+
+    def test_import_does_not_import_yaml(self):
+        self.assertEqual(self.run_python(
+            'import sys, pyaml_env; '
+            'print("yaml" in sys.modules, len(pyaml_env.__all__), '
+            'sorted(m for m in sys.modules if m.startswith("pyaml_env")))'
+        ), ['False', str(len(pyaml_env.__all__)), "['pyaml_env']"])
+
+    def test_first_use_imports_the_module(self):
+        self.assertEqual(self.run_python(
+            'import sys, pyaml_env; pyaml_env.ParseLimits; '
+            'print("pyaml_env.limits" in sys.modules, '
+            '"pyaml_env.shared_config" in sys.modules)'
+        ), ['True', 'False'])
+
+    def test_public_api(self):
+        for name in pyaml_env.__all__:
+            self.assertEqual(getattr(pyaml_env, name).__name__, name)
+        self.assertTrue(set(pyaml_env.__all__) <= set(dir(pyaml_env)))
+        with self.assertRaises(AttributeError):
+            pyaml_env.not_there
+
+    def test_submodule_does_not_hide_function(self):
+        self.assertEqual(self.run_python(
+            'import pyaml_env.parse_config, pyaml_env.cli, pyaml_env; '
+            'print(callable(pyaml_env.parse_config), '
+            'callable(pyaml_env.dump_config), '
+            'callable(pyaml_env.scan_env_references))'
+        ), ['True', 'True', 'True'])
+
+
+if __name__ == '__main__':
+    unittest.main()
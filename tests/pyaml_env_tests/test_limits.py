@@ -0,0 +1,106 @@
+import unittest
+
+import yaml
+
+from pyaml_env import parse_config, ParseLimits, ParseLimitExceeded
+
+
+class TestParseLimits(unittest.TestCase):
+    def setUp(self):
+        self.alias_bomb = '''
+        a: &a ["lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol"]
+        b: &b [*a, *a, *a, *a, *a, *a, *a, *a, *a]
+        c: &c [*b, *b, *b, *b, *b, *b, *b, *b, *b]
+        d: &d [*c, *c, *c, *c, *c, *c, *c, *c, *c]
+        e: &e [*d, *d, *d, *d, *d, *d, *d, *d, *d]
+        f: &f [*e, *e, *e, *e, *e, *e, *e, *e, *e]
+        '''
+        self.test_data = '''
+        test1:
+            data0: !ENV ${ENV_TAG1:default}
+            data1: [1, 2, 3]
+        '''
+
+    def test_parse_config_within_limits(self):
+        limits = ParseLimits(
+            max_nodes=10,
+            max_depth=3,
+            max_alias_expansions=0,
+            max_document_bytes=1024
+        )
+        config = parse_config(data=self.test_data, limits=limits)
+
+        self.assertDictEqual(
+            config,
+            {'test1': {'data0': 'default', 'data1': [1, 2, 3]}}
+        )
+
+    def test_parse_config_max_nodes(self):
+        with self.assertRaises(ParseLimitExceeded):
+            _ = parse_config(
+                data=self.alias_bomb, limits=ParseLimits(max_nodes=10000)
+            )
+
+    def test_parse_config_max_alias_expansions(self):
+        with self.assertRaises(ParseLimitExceeded):
+            _ = parse_config(
+                data=self.alias_bomb,
+                limits=ParseLimits(max_alias_expansions=20)
+            )
+
+    def test_parse_config_max_depth(self):
+        with self.assertRaises(ParseLimitExceeded):
+            _ = parse_config(
+                data='a: ' + '[' * 50 + ']' * 50,
+                limits=ParseLimits(max_depth=20)
+            )
+
+    def test_parse_config_max_document_bytes(self):
+        with self.assertRaises(ParseLimitExceeded):
+            _ = parse_config(
+                data=self.test_data,
+                limits=ParseLimits(max_document_bytes=10)
+            )
+
+    def test_parse_config_limits_not_registered_on_loader(self):
+        _ = parse_config(data=self.test_data, limits=ParseLimits(max_depth=3))
+
+        config = parse_config(data='a: [[[[1]]]]')
+        self.assertEqual(config, {'a': [[[[1]]]]})
+        self.assertFalse(hasattr(yaml.SafeLoader, 'parse_limits'))
+
+    @unittest.skipUnless(yaml.__with_libyaml__, 'libyaml is not available')
+    def test_parse_config_limits_c_loader(self):
+        loader = yaml.CSafeLoader
+        for data, limits in (
+                (self.alias_bomb, ParseLimits(max_nodes=1000)),
+                (self.alias_bomb, ParseLimits(max_alias_expansions=20)),
+                ('a: ' + '[' * 50 + ']' * 50, ParseLimits(max_depth=5)),
+        ):
+            with self.assertRaises(ParseLimitExceeded):
+                _ = parse_config(data=data, loader=loader, limits=limits)
+
+        limits = ParseLimits(max_nodes=10, max_depth=3, max_alias_expansions=0)
+        self.assertDictEqual(
+            parse_config(data=self.test_data, loader=loader, limits=limits),
+            {'test1': {'data0': 'default', 'data1': [1, 2, 3]}}
+        )
+        # the same counts as with the python loaders
+        for loader in (yaml.SafeLoader, yaml.CSafeLoader):
+            self.assertEqual(
+                parse_config(
+                    data='a: &a {b: 1}\nc: *a\n', loader=loader,
+                    limits=ParseLimits(max_nodes=9, max_alias_expansions=1)
+                ),
+                {'a': {'b': 1}, 'c': {'b': 1}}
+            )
+            for limits in (
+                    ParseLimits(max_nodes=8),
+                    ParseLimits(max_alias_expansions=0),
+                    ParseLimits(max_depth=1),
+            ):
+                with self.assertRaises(ParseLimitExceeded):
+                    _ = parse_config(
+                        data='a: &a {b: 1}\nc: *a\n', loader=loader,
+                        limits=limits
+                    )
@@ -760,3 +760,139 @@ class TestParseConfig(unittest.TestCase):
         self.assertEqual(config['data1'], 27017.0)
         self.assertEqual(config['data3'], "some_value")
         self.assertEqual(config['data4'], False)
+
+    def test_parse_config_aliased_env_vars_resolved_once(self):
+        os.environ[self.env_var1] = '1024'
+        test_data = '''
+                defaults: &defaults
+                    port: !ENV tag:yaml.org,2002:int ${ENV_TAG1}
+                    host: !ENV ${ENV_TAG2:localhost}
+                test1:
+                    <<: *defaults
+                    name: test1
+                test2:
+                    <<: *defaults
+                    host: !ENV ${ENV_TAG2:localhost}
+                '''
+        config = parse_config(data=test_data)
+
+        self.assertEqual(config['test1']['port'], 1024)
+        self.assertEqual(config['test2']['port'], 1024)
+        self.assertEqual(config['test1']['host'], 'localhost')
+        # aliased and repeated placeholders share one resolved value
+        self.assertIs(config['test1']['host'], config['defaults']['host'])
+        self.assertIs(config['test2']['host'], config['defaults']['host'])
+
+    def test_parse_config_nested_default_values(self):
+        os.environ[self.env_var2] = 'fallback'
+        test_data = '''
+        test1:
+            data0: !ENV ${ENV_TAG1:${ENV_TAG2:localhost}}
+            data1: !ENV ${ENV_TAG1:http://${ENV_TAG3:localhost}:${ENV_TAG2}}
+            data2: !ENV tag:yaml.org,2002:int ${ENV_TAG1:${ENV_TAG3:5432}}
+        '''
+        config = parse_config(data=test_data, nested=True)
+
+        expected_config = {
+            'test1': {
+                'data0': 'fallback',
+                'data1': 'http://localhost:fallback',
+                'data2': 5432
+            }
+        }
+
+        self.assertDictEqual(config, expected_config)
+
+    def test_parse_config_nested_variable_references(self):
+        os.environ[self.env_var1] = 'http://${ENV_TAG2}:${ENV_TAG3:5432}'
+        os.environ[self.env_var2] = 'localhost'
+        test_data = '''
+        test1:
+            data0: !ENV ${ENV_TAG1}/db
+            data1: !ENV ${ENV_TAG1}/api
+        '''
+        config = parse_config(data=test_data, nested=True)
+
+        self.assertDictEqual(config, {
+            'test1': {
+                'data0': 'http://localhost:5432/db',
+                'data1': 'http://localhost:5432/api'
+            }
+        })
+
+    def test_parse_config_nested_circular_reference(self):
+        os.environ[self.env_var1] = 'a${ENV_TAG2}'
+        os.environ[self.env_var2] = 'b${ENV_TAG1}'
+        test_data = '''
+        test1:
+            data0: !ENV ${ENV_TAG1}
+        '''
+
+        with self.assertRaises(ValueError):
+            _ = parse_config(data=test_data, nested=True)
+
+    def test_parse_config_no_tag_native_types(self):
+        os.environ[self.env_var1] = 'it works!'
+        test_data = '''
+        test1:
+            data0: test1${ENV_TAG1}
+            data1: 1024
+            data2: 2021-01-01
+            data3: 'quoted ${ENV_TAG1}'
+            data4: ${}
+            data5: [true, null, 1.5]
+        '''
+        config = parse_config(data=test_data, tag=None)
+
+        self.assertEqual(config['test1']['data0'], 'test1it works!')
+        self.assertEqual(config['test1']['data1'], 1024)
+        self.assertEqual(str(config['test1']['data2']), '2021-01-01')
+        self.assertEqual(config['test1']['data3'], 'quoted ${ENV_TAG1}')
+        self.assertEqual(config['test1']['data4'], '${}')
+        self.assertEqual(config['test1']['data5'], [True, None, 1.5])
+        # the shared loader is left untouched
+        self.assertNotIn(None, yaml.SafeLoader.yaml_implicit_resolvers)
+        self.assertIs(
+            yaml.SafeLoader.yaml_constructors[None],
+            yaml.SafeLoader.construct_undefined
+        )
+
+    def test_parse_config_concurrent_different_options(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        os.environ[self.env_var1] = 'it works!'
+        options = [
+            ('!ENV', ':', 'N/A'),
+            ('!TEST', ':', 'N/A'),
+            ('!ENV', '!', 'NONE'),
+            ('!TEST', '!', '++'),
+            (None, ':', 'DEFAULT'),
+        ]
+
+        def parse(i):
+            tag, default_sep, default_value = options[i % len(options)]
+            test_data = f'''
+            test1:
+                data0: {tag or ''} ${{ENV_TAG1}}
+                data1: {tag or ''} ${{ENV_TAG2{default_sep}default{i}}}
+                data2: {tag or ''} ${{ENV_TAG3}}
+            '''
+            config = parse_config(
+                data=test_data,
+                tag=tag,
+                default_sep=default_sep,
+                default_value=default_value
+            )
+            expected = {
+                'test1': {
+                    'data0': 'it works!',
+                    'data1': f'default{i}',
+                    'data2': default_value,
+                }
+            }
+            return config == expected
+
+        with ThreadPoolExecutor(16) as executor:
+            results = list(executor.map(parse, range(2000)))
+
+        self.assertTrue(all(results))
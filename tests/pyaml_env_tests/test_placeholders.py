@@ -0,0 +1,42 @@
+import unittest
+
+from pyaml_env.placeholders import parse_placeholders, NestedResolver
+
+
+class TestPlaceholders(unittest.TestCase):
+    def test_parse_placeholders(self):
+        self.assertEqual(
+            parse_placeholders('http://${HOST:${FALLBACK:localhost}}:${PORT}', ':'),
+            ['http://', ('HOST', [('FALLBACK', ['localhost'])]), ':', ('PORT', None)]
+        )
+        self.assertEqual(parse_placeholders('${A:}', ':'), [('A', [])])
+        # only ${ starts a nested placeholder
+        self.assertEqual(
+            parse_placeholders('${A:defaul^{}t1}', ':'),
+            [('A', ['defaul^{']), 't1}']
+        )
+        self.assertEqual(parse_placeholders('${A:${B}', ':'), ['${A:', ('B', None)])
+        self.assertEqual(parse_placeholders('no ${ placeholders', ':'), ['no ${ placeholders'])
+        self.assertEqual(parse_placeholders('${A:b}', ''), [('A:b', None)])
+
+    def test_nested_resolver_resolves_variables_once(self):
+        class CountingEnviron(dict):
+            lookups = 0
+
+            def get(self, key, default=None):
+                self.lookups += 1
+                return super().get(key, default)
+
+        environ = CountingEnviron(URL='http://${HOST}', HOST='localhost')
+        resolver = NestedResolver(':', 'N/A', False, environ)
+
+        self.assertEqual(resolver.resolve('${URL}/a'), 'http://localhost/a')
+        self.assertEqual(resolver.resolve('${URL}/b ${MISSING}'), 'http://localhost/b N/A')
+        self.assertEqual(environ.lookups, 3)
+
+    def test_nested_resolver_raise_if_na(self):
+        resolver = NestedResolver(':', 'N/A', True, {'A': '1'})
+
+        self.assertEqual(resolver.resolve('${B:${A:2}}'), '1')
+        with self.assertRaises(ValueError):
+            resolver.resolve('${B:${A}}')
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+from pyaml_env import parse_config, Provider, FileProvider
+
+
+class CountingProvider(Provider):
+    def __init__(self, values, ttl=60):
+        super().__init__(ttl)
+        self.values = values
+        self.calls = []
+
+    def fetch_many(self, keys):
+        self.calls.append(keys)
+        return {k: self.values[k] for k in keys if k in self.values}
+
+
+class TestProviders(unittest.TestCase):
+    def setUp(self):
+        self.env_var1 = 'ENV_TAG1'
+        self.secrets_dir = tempfile.TemporaryDirectory()
+        self.secret_path = os.path.join(self.secrets_dir.name, 'db_pass')
+        with open(self.secret_path, 'w') as secret_file:
+            secret_file.write('very_secret\n')
+        self.test_data = f'''
+        test1:
+            data0: !ENV ${{file:{self.secret_path}}}
+            data1: !ENV ${{vault:db/user}}@${{vault:db/host}}
+            data2: !ENV ${{ENV_TAG1:default}}
+            data3: !ENV ${{vault:db/user}}
+            data4: ${{vault:not/tagged}}
+        '''
+
+    def tearDown(self):
+        self.secrets_dir.cleanup()
+        if self.env_var1 in os.environ:
+            del os.environ[self.env_var1]
+
+    def test_parse_config_providers(self):
+        os.environ[self.env_var1] = 'it works!'
+        vault = CountingProvider({'db/user': 'paws', 'db/host': 'localhost'})
+        config = parse_config(
+            data=self.test_data,
+            providers={'file': FileProvider(), 'vault': vault}
+        )
+
+        self.assertDictEqual(config, {
+            'test1': {
+                'data0': 'very_secret',
+                'data1': 'paws@localhost',
+                'data2': 'it works!',
+                'data3': 'paws',
+                'data4': '${vault:not/tagged}',
+            }
+        })
+        # one batched fetch for all the keys of the document
+        self.assertEqual(vault.calls, [['db/host', 'db/user']])
+
+    def test_parse_config_providers_cached(self):
+        vault = CountingProvider({'db/user': 'paws', 'db/host': 'localhost'})
+        _ = parse_config(data=self.test_data, providers={
+            'file': FileProvider(), 'vault': vault
+        })
+        vault.values['db/user'] = 'meaw'
+        config = parse_config(data=self.test_data, providers={
+            'file': FileProvider(), 'vault': vault
+        })
+
+        self.assertEqual(len(vault.calls), 1)
+        self.assertEqual(config['test1']['data3'], 'paws')
+
+        vault.clear()
+        config = parse_config(data=self.test_data, providers={
+            'file': FileProvider(), 'vault': vault
+        })
+        self.assertEqual(config['test1']['data3'], 'meaw')
+
+    def test_parse_config_providers_ttl(self):
+        vault = CountingProvider({'db/user': 'paws'}, ttl=0)
+        for _ in range(2):
+            _ = parse_config(
+                data='a: !ENV ${vault:db/user}', providers={'vault': vault}
+            )
+
+        self.assertEqual(vault.calls, [['db/user'], ['db/user']])
+
+    def test_parse_config_providers_missing_value(self):
+        providers = {'file': FileProvider()}
+        test_data = 'a: !ENV ${file:/does/not/exist}'
+
+        self.assertEqual(
+            parse_config(data=test_data, providers=providers), {'a': 'N/A'}
+        )
+        with self.assertRaises(ValueError):
+            _ = parse_config(
+                data=test_data, providers=providers, raise_if_na=True
+            )
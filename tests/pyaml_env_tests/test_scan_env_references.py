@@ -0,0 +1,110 @@
+import os
+import unittest
+
+from pyaml_env import (
+    scan_env_references,
+    find_missing_env_references,
+    EnvReference,
+)
+
+
+class TestScanEnvReferences(unittest.TestCase):
+    def setUp(self):
+        self.test_file_names = [
+            f'{os.path.abspath(".")}/testfile_scan{i}.yaml' for i in range(3)
+        ]
+        self.test_data = '''test1:
+  data0: !ENV ${ENV_TAG1}
+  data1: !ENV http://${ENV_TAG2:localhost}:${ENV_TAG3:5432}
+  data2: ${ENV_TAG4}
+  data3: !TEST ${ENV_TAG5}
+  data4: !ENV tag:yaml.org,2002:float ${ENV_TAG6:1.5}
+'''
+
+    def tearDown(self):
+        for name in self.test_file_names:
+            if os.path.isfile(name):
+                os.remove(name)
+
+    def test_scan_env_references(self):
+        references = scan_env_references(data=self.test_data)
+
+        self.assertEqual(references, [
+            EnvReference('ENV_TAG1', None, 2, 10),
+            EnvReference('ENV_TAG2', 'localhost', 3, 10),
+            EnvReference('ENV_TAG3', '5432', 3, 10),
+            EnvReference('ENV_TAG6', '1.5', 6, 10),
+        ])
+
+    def test_scan_env_references_no_tag(self):
+        references = scan_env_references(data=self.test_data, tag=None)
+
+        # like parse_config, any unknown tag is resolved too
+        self.assertEqual(
+            [r.name for r in references],
+            ['ENV_TAG1', 'ENV_TAG2', 'ENV_TAG3', 'ENV_TAG4', 'ENV_TAG5', 'ENV_TAG6']
+        )
+
+    def test_scan_env_references_nested(self):
+        references = scan_env_references(
+            data='a: !ENV ${ENV_TAG1:http://${ENV_TAG2:localhost}}',
+            nested=True
+        )
+
+        self.assertEqual(references, [
+            EnvReference('ENV_TAG1', 'http://${ENV_TAG2:localhost}', 1, 4),
+            EnvReference('ENV_TAG2', 'localhost', 1, 4, within=('ENV_TAG1',)),
+        ])
+
+    def test_find_missing_env_references_nested(self):
+        with open(self.test_file_names[0], 'w') as test_file:
+            test_file.write('a: !ENV ${ENV_TAG1:${ENV_TAG2:${ENV_TAG3}}}\n')
+        paths = self.test_file_names[:1]
+
+        self.assertEqual(
+            find_missing_env_references(paths, {'ENV_TAG1': 'set'}, nested=True),
+            {}
+        )
+        self.assertEqual(
+            find_missing_env_references(paths, {'ENV_TAG2': 'set'}, nested=True),
+            {}
+        )
+        self.assertEqual(
+            find_missing_env_references(paths, {}, nested=True),
+            {paths[0]: [EnvReference(
+                'ENV_TAG3', None, 1, 4, paths[0], ('ENV_TAG1', 'ENV_TAG2')
+            )]}
+        )
+
+    def test_find_missing_env_references(self):
+        for i, name in enumerate(self.test_file_names):
+            with open(name, 'w') as test_file:
+                test_file.write(
+                    f'data{i}: !ENV ${{ENV_TAG{i}}}/${{ENV_TAG9}}\n'
+                    f'other: !ENV ${{ENV_TAG8:default}}\n'
+                )
+        environ = {'ENV_TAG1': 'set'}
+
+        expected = {
+            self.test_file_names[0]: [
+                EnvReference('ENV_TAG0', None, 1, 8, self.test_file_names[0]),
+                EnvReference('ENV_TAG9', None, 1, 8, self.test_file_names[0]),
+            ],
+            self.test_file_names[1]: [
+                EnvReference('ENV_TAG9', None, 1, 8, self.test_file_names[1]),
+            ],
+            self.test_file_names[2]: [
+                EnvReference('ENV_TAG2', None, 1, 8, self.test_file_names[2]),
+                EnvReference('ENV_TAG9', None, 1, 8, self.test_file_names[2]),
+            ],
+        }
+        self.assertEqual(
+            find_missing_env_references(self.test_file_names, environ),
+            expected
+        )
+        self.assertEqual(
+            find_missing_env_references(
+                self.test_file_names, environ, processes=2
+            ),
+            expected
+        )
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import unittest
+from unittest import mock
+
+from pyaml_env import build_section_index, load_section, FlatIndex
+
+
+class TestSectionIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_file_name = f'{os.path.abspath(".")}/testfile_section.yaml'
+        self.index_file_name = self.test_file_name + '.idx'
+        self.env_var1 = 'ENV_TAG1'
+        self.test_data = '''
+database:
+  name: test_db
+  url: !ENV 'http://${ENV_TAG1:localhost}:5432'
+tenants:
+  acme:
+    region: ëu-west-1
+    owner: !ENV ${ENV_TAG1:nobody}
+  globex:
+    region: us-east-1
+    limits: {cpu: 2, memory: 4}
+flow: {a: 1, b: 2}
+'''
+        with open(self.test_file_name, 'w', encoding='utf-8') as test_file:
+            test_file.write(self.test_data)
+
+    def tearDown(self):
+        if self.env_var1 in os.environ:
+            del os.environ[self.env_var1]
+        for name in (self.test_file_name, self.index_file_name):
+            if os.path.isfile(name):
+                os.remove(name)
+
+    def test_build_section_index(self):
+        index = build_section_index(self.test_file_name, depth=2)
+
+        self.assertTrue(os.path.isfile(self.index_file_name))
+        sections = [tuple(keys) for keys, _, _ in index['sections']]
+        self.assertIn(('database',), sections)
+        self.assertIn(('tenants', 'acme'), sections)
+        self.assertIn(('tenants', 'globex'), sections)
+        # flow style mappings are not split further
+        self.assertIn(('flow',), sections)
+        self.assertNotIn(('flow', 'a'), sections)
+
+    def test_load_section(self):
+        os.environ[self.env_var1] = 'it works!'
+
+        self.assertDictEqual(
+            load_section(self.test_file_name, 'database'),
+            {'name': 'test_db', 'url': 'http://it works!:5432'}
+        )
+        self.assertDictEqual(
+            load_section(self.test_file_name, 'tenants.acme', depth=2),
+            {'region': 'ëu-west-1', 'owner': 'it works!'}
+        )
+        self.assertEqual(
+            load_section(self.test_file_name, ['tenants', 'globex', 'limits']),
+            {'cpu': 2, 'memory': 4}
+        )
+        self.assertEqual(load_section(self.test_file_name, 'flow.b'), 2)
+
+    def test_load_section_rebuilds_stale_index(self):
+        load_section(self.test_file_name, 'database')
+        with open(self.test_file_name, 'a', encoding='utf-8') as test_file:
+            test_file.write('extra:\n  value: 42\n')
+
+        self.assertEqual(load_section(self.test_file_name, 'extra.value'), 42)
+        with open(self.index_file_name) as index_file:
+            sections = [keys for keys, _, _ in json.load(index_file)['sections']]
+        self.assertIn(['extra'], sections)
+
+    def test_load_section_flatten(self):
+        index = load_section(self.test_file_name, 'tenants', flatten=True)
+
+        self.assertIsInstance(index, FlatIndex)
+        self.assertEqual(dict(index), {
+            'acme.region': 'ëu-west-1',
+            'acme.owner': 'nobody',
+            'globex.region': 'us-east-1',
+            'globex.limits.cpu': 2,
+            'globex.limits.memory': 4,
+        })
+        self.assertEqual(
+            dict(load_section(self.test_file_name, 'flow', flatten=True)),
+            {'a': 1, 'b': 2}
+        )
+        with self.assertRaises(ValueError):
+            load_section(self.test_file_name, 'flow.a', flatten=True)
+
+    def test_load_section_threads(self):
+        errors = []
+        barrier = threading.Barrier(8)
+
+        def load():
+            barrier.wait()
+            try:
+                for _ in range(10):
+                    load_section(self.test_file_name, 'tenants.acme', depth=2)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=load) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [f for f in os.listdir('.') if f.endswith('.tmp')], []
+        )
+
+    def test_load_section_index_not_writable(self):
+        with mock.patch(
+                'tempfile.mkstemp', side_effect=PermissionError('read-only')
+        ):
+            index = build_section_index(self.test_file_name)
+            self.assertEqual(
+                load_section(self.test_file_name, 'database.name'), 'test_db'
+            )
+
+        self.assertIn(['database'], [keys for keys, _, _ in index['sections']])
+        self.assertFalse(os.path.isfile(self.index_file_name))
+
+    def test_load_section_alias_outside_section(self):
+        with open(self.test_file_name, 'w') as test_file:
+            test_file.write(
+                'defaults: &defaults\n'
+                '  region: eu\n'
+                'acme:\n'
+                '  <<: *defaults\n'
+                '  owner: !ENV ${ENV_TAG1:nobody}\n'
+            )
+
+        self.assertDictEqual(
+            load_section(self.test_file_name, 'acme'),
+            {'region': 'eu', 'owner': 'nobody'}
+        )
@@ -0,0 +1,97 @@
+import datetime
+import multiprocessing
+import os
+import unittest
+
+from pyaml_env import (
+    parse_config,
+    dump_shared,
+    load_shared,
+    SharedMapping,
+    SharedSequence,
+)
+
+
+def _read_in_worker(path):
+    config = load_shared(path)
+    return config.test1.data0, config['test1']['data3'][1]['c']
+
+
+class TestSharedConfig(unittest.TestCase):
+    def setUp(self):
+        self.test_file_name = f'{os.path.abspath(".")}/testfile_shared.bin'
+        self.env_var1 = 'ENV_TAG1'
+        os.environ[self.env_var1] = 'it works!'
+        self.config = parse_config(data='''
+        test1:
+            data0: !ENV ${ENV_TAG1}
+            data1: {b: 1, a: 2.5, 1: null, x: false}
+            data2: 2021-01-01
+            data3: [1, {c: ëxtra}, [], {}]
+            data4: 100000000000000000000000
+        test0: !!binary aGVsbG8=
+        ''')
+
+    def tearDown(self):
+        if self.env_var1 in os.environ:
+            del os.environ[self.env_var1]
+        if os.path.isfile(self.test_file_name):
+            os.remove(self.test_file_name)
+
+    def test_dump_load_shared(self):
+        dump_shared(self.config, self.test_file_name)
+        shared = load_shared(self.test_file_name)
+
+        self.assertIsInstance(shared, SharedMapping)
+        self.assertIsInstance(shared['test1']['data3'], SharedSequence)
+        self.assertEqual(shared, self.config)
+        self.assertEqual(shared.to_dict(), self.config)
+        self.assertIsInstance(shared.to_dict()['test1']['data3'], list)
+        # the original key order is kept
+        self.assertEqual(list(shared['test1']['data1']), ['b', 'a', 1, 'x'])
+        self.assertEqual(shared.test1.data2, datetime.date(2021, 1, 1))
+        self.assertEqual(shared.test1.data3[-1], {})
+        self.assertEqual(shared.test1.data3[1:3], [{'c': 'ëxtra'}, []])
+        self.assertEqual(shared['test0'], b'hello')
+        with self.assertRaises(KeyError):
+            _ = shared['missing']
+        with self.assertRaises(AttributeError):
+            _ = shared.missing
+
+    def test_load_shared_in_worker(self):
+        dump_shared(self.config, self.test_file_name)
+
+        with multiprocessing.Pool(2) as pool:
+            results = pool.map(_read_in_worker, [self.test_file_name] * 4)
+
+        self.assertEqual(results, [('it works!', 'ëxtra')] * 4)
+
+    def test_load_shared_invalid_file(self):
+        with open(self.test_file_name, 'wb') as test_file:
+            test_file.write(b'not a shared config')
+
+        with self.assertRaises(ValueError):
+            _ = load_shared(self.test_file_name)
+
+    def test_dump_shared_recursive(self):
+        recursive = []
+        recursive.append(recursive)
+
+        with self.assertRaises(ValueError):
+            dump_shared(recursive, self.test_file_name)
+        self.assertEqual(
+            [f for f in os.listdir('.') if f.endswith('.tmp')], []
+        )
+
+    def test_dump_shared_while_loaded(self):
+        dump_shared({'k': 'x' * 100000, 'l': list(range(1000))},
+                    self.test_file_name)
+        shared = load_shared(self.test_file_name)
+
+        dump_shared({'k': 'small'}, self.test_file_name)
+
+        # the view keeps reading the previous file, new loads see the new one
+        self.assertEqual(shared['k'], 'x' * 100000)
+        self.assertEqual(shared['l'][-1], 999)
+        self.assertEqual(load_shared(self.test_file_name).to_dict(),
+                         {'k': 'small'})